@@ -8,25 +8,153 @@ IOTA's unique features.
 
 import os
 import sys
+import copy
 import json
+import math
 import time
+import random
+import asyncio
 import logging
+import functools
+import threading
+import uuid
 import requests
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union, Tuple, NamedTuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
+import pandas as pd
+from cachetools import LRUCache, TTLCache
 
-# Configured logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("iota_connection.log"),
-        logging.StreamHandler()
-    ]
-)
+# Prefer orjson for decoding node responses and encoding request bodies; it
+# works on bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# ijson lets very large address-output payloads be parsed incrementally
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ciso8601 parses ISO-8601 timestamps much faster than datetime.fromisoformat
+try:
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    def _parse_iso_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Configured logging (only if the application hasn't set up handlers already)
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("iota_connection.log"),
+            logging.StreamHandler()
+        ]
+    )
 logger = logging.getLogger("iota_connection")
 
+class IOTAFeatures(NamedTuple):
+    """
+    Numeric IOTA features for one address, in feature-matrix column order.
+    """
+    iota_balance: int
+    iota_transaction_count: int
+    iota_message_count: int
+    iota_native_tokens_count: int
+    iota_first_activity_days: int
+    iota_activity_regularity: float
+    cross_layer_transfers: int
+    incoming_transaction_ratio: float
+
+# Column order of the numeric IOTA features in feature matrices
+FEATURE_ORDER = IOTAFeatures._fields
+
+# Simulated market parameters per token symbol
+_TOKEN_CONFIGS = {
+    'IOTA': {
+        'base_price': 0.25,
+        'volatility': 0.025
+    },
+    'ETH': {
+        'base_price': 2000.0,
+        'volatility': 0.02
+    },
+    'BTC': {
+        'base_price': 40000.0,
+        'volatility': 0.018
+    },
+    'USDC': {
+        'base_price': 1.0,
+        'volatility': 0.001
+    },
+    'DAI': {
+        'base_price': 1.0,
+        'volatility': 0.001
+    }
+}
+
+_DEFAULT_TOKEN_CONFIG = {
+    'base_price': 1.0,
+    'volatility': 0.02
+}
+
+@functools.lru_cache(maxsize=64)
+def _token_config(symbol: str) -> Dict[str, Any]:
+    """
+    Look up the configuration for a token symbol.
+    
+    Args:
+        symbol: Upper-cased token symbol
+        
+    Returns:
+        Token configuration
+    """
+    return _TOKEN_CONFIGS.get(symbol, _DEFAULT_TOKEN_CONFIG)
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(config_path: str) -> Dict[str, Any]:
+    """
+    Read and parse a connection configuration file once per path.
+    
+    Args:
+        config_path: Path to configuration file
+        
+    Returns:
+        Parsed configuration (shared; callers must copy before mutating)
+    """
+    with open(config_path, 'rb') as f:
+        return _json_loads(f.read())
+
+def _to_epoch_seconds(timestamp: Union[int, float, str, None]) -> Union[int, float, None]:
+    """
+    Normalize a node timestamp to Unix epoch seconds.
+    
+    Numeric timestamps are returned unchanged; only ISO-8601 strings are parsed.
+    
+    Args:
+        timestamp: Epoch seconds, numeric string or ISO-8601 string
+        
+    Returns:
+        Epoch seconds, or None if no timestamp was given
+    """
+    if timestamp is None or isinstance(timestamp, (int, float)):
+        return timestamp
+    if timestamp.isdigit():
+        return int(timestamp)
+    return _parse_iso_datetime(timestamp).timestamp()
+
 class IOTAConnection:
     """
     Provides connectivity to the IOTA network for AI model integration.
@@ -66,29 +194,77 @@ class IOTAConnection:
         # Initialize connection status
         self.is_connected = False
         self.health_check_count = 0
-        self.last_health_check = 0
-        
-        # Setup node health tracking
-        self.node_health = {}
-        for node in self.nodes:
-            self.node_health[node] = {
-                'healthy': True,
-                'failure_count': 0,
-                'last_check': 0,
-                'response_time': 0
-            }
+        self.last_health_check = None  # monotonic_ns of the last periodic check
+        
+        # Setup node health tracking as one array per field, indexed like self.nodes
+        node_count = len(self.nodes)
+        self._node_index = {node: i for i, node in enumerate(self.nodes)}
+        self._node_healthy = np.ones(node_count, dtype=bool)
+        self._node_failure_count = np.zeros(node_count, dtype=np.int32)
+        self._node_last_check = np.zeros(node_count, dtype=np.float64)
+        self._node_response_time = np.zeros(node_count, dtype=np.float32)
+        
+        # Resolve request settings once instead of on every request
+        self._retry_count = int(self.config.get('retry_count', 3))
+        self._retry_delay = self.config.get('retry_delay', 1000) / 1000  # Convert to seconds
+        self._retry_cap = self.config.get('retry_cap', 30.0)
+        self._retry_on_mutating = self.config.get('retry_on_mutating', True)
+        self._connect_attempts = int(self.config.get('retry_attempts', 3))
+        self._connect_delay = self.config.get('retry_delay', 2000) / 1000  # Convert to seconds
+        self._request_timeout = self.config.get('request_timeout', 30)
+        self._max_cache_age = self.config.get('max_cache_age', 300)
+        self._stream_threshold = self.config.get('stream_threshold_bytes', 1024 * 1024)
+        self._health_check_interval_ns = int(self.config.get('monitoring', {}).get('health_check_interval', 300) * 1_000_000_000)
+        self._default_headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        
+        # Add authentication if configured
+        auth_config = self.config.get('authentication', {})
+        auth_type = auth_config.get('type', 'none')
+        self._auth_headers = {}
+        
+        if auth_type == 'api_key':
+            self._auth_headers['X-API-Key'] = auth_config.get('api_key', '')
+        elif auth_type == 'bearer':
+            self._auth_headers['Authorization'] = f"Bearer {auth_config.get('token', '')}"
         
-        # Initialize cache
+        # Pooled HTTP session so node requests reuse keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max(4, len(self.nodes)),
+            pool_maxsize=32,
+            max_retries=0
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(self._default_headers)
+        # Advertise every compression scheme urllib3 can decode here (br/zstd
+        # only when brotli/zstandard are installed); bodies are decoded transparently
+        self._session.headers.update(make_headers(accept_encoding=True))
+        
+        # Initialize bounded TTL caches (entries expire after max_cache_age). Expiry
+        # runs on the integer monotonic clock so wall-clock jumps can't resurrect
+        # or prematurely expire entries
+        cache_ttl_ns = int(self._max_cache_age * 1_000_000_000)
         self.cache = {
-            'address_data': {},
-            'token_prices': {},
-            'network_stats': {}
+            'address_data': TTLCache(maxsize=4096, ttl=cache_ttl_ns, timer=time.monotonic_ns),
+            'token_prices': TTLCache(maxsize=1024, ttl=cache_ttl_ns, timer=time.monotonic_ns),
+            'network_stats': TTLCache(maxsize=64, ttl=cache_ttl_ns, timer=time.monotonic_ns)
         }
+        # Last known validators (ETag/Last-Modified) per address. These outlive the
+        # TTL cache so expired entries can be revalidated with a conditional GET
+        self._address_validators = LRUCache(maxsize=4096)
+        self._cache_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
         
-        # Connect to IOTA network
-        self._connect()
+        # Shared random generator for simulated market data
+        self._rng = np.random.default_rng()
         
-        logger.info(f"IOTA Connection initialized: connected={self.is_connected}, network={self.network}")
+        # Nodes are probed lazily on first use (see ensure_connected) so that
+        # construction never blocks on the network
+        logger.info(f"IOTA Connection initialized: network={self.network}")
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """
@@ -101,8 +277,8 @@ class IOTAConnection:
             Configuration dictionary
         """
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            # Parsed files are cached per path; each connection gets its own copy
+            config = copy.deepcopy(_read_config_file(config_path))
             logger.info(f"Loaded configuration from {config_path}")
             return config
         except FileNotFoundError:
@@ -137,47 +313,27 @@ class IOTAConnection:
             return False
             
         # Try all available nodes with retry logic
-        max_attempts = self.config.get('retry_attempts', 3)
+        max_attempts = self._connect_attempts
         
         for attempt in range(max_attempts):
-            for i in range(len(self.nodes)):
-                node_url = self.nodes[self.current_node_index]
+            logger.info(f"Probing {len(self.nodes)} IOTA nodes (attempt {attempt+1}/{max_attempts})")
+            
+            # Test all nodes concurrently and take the first healthy one
+            node_url = self._probe_nodes(self.nodes, self._request_timeout)
+            
+            if node_url is not None:
+                self.current_node_index = self.nodes.index(node_url)
+                self.is_connected = True
+                logger.info(f"Successfully connected to IOTA node: {node_url}")
                 
-                try:
-                    logger.info(f"Connecting to IOTA node: {node_url} (attempt {attempt+1}/{max_attempts})")
-                    
-                    # Test connection with health endpoint
-                    response = self._make_request(
-                        f"{node_url}/health", 
-                        timeout=self.config.get('request_timeout', 30)
-                    )
-                    
-                    if response.status_code == 200:
-                        self.is_connected = True
-                        logger.info(f"Successfully connected to IOTA node: {node_url}")
-                        
-                        # Update node health
-                        self.node_health[node_url]['healthy'] = True
-                        self.node_health[node_url]['failure_count'] = 0
-                        self.node_health[node_url]['last_check'] = time.time()
-                        
-                        # Get basic node info
-                        self._get_node_info()
-                        
-                        return True
-                    else:
-                        logger.warning(f"Failed to connect to {node_url}: HTTP {response.status_code}")
-                        self._mark_node_unhealthy(node_url)
-                except Exception as e:
-                    logger.warning(f"Error connecting to {node_url}: {str(e)}")
-                    self._mark_node_unhealthy(node_url)
+                # Get basic node info
+                self._get_node_info()
                 
-                # Try next node
-                self.current_node_index = (self.current_node_index + 1) % len(self.nodes)
+                return True
             
             # If we've tried all nodes but haven't returned, wait before next attempt
             if attempt < max_attempts - 1:
-                delay = self.config.get('retry_delay', 2) * (2 ** attempt)  # Exponential backoff
+                delay = self._backoff_delay(attempt, self._connect_delay)
                 logger.info(f"Retrying connection after {delay}s delay")
                 time.sleep(delay)
         
@@ -186,8 +342,83 @@ class IOTAConnection:
         logger.error("Failed to connect to any IOTA node after all attempts")
         return False
     
+    def ensure_connected(self) -> bool:
+        """
+        Connect to the IOTA network if no node has been selected yet.
+        
+        Concurrent callers share a single connection attempt.
+        
+        Returns:
+            Connection status
+        """
+        if self.is_connected:
+            return True
+        
+        with self._connect_lock:
+            if not self.is_connected:
+                self._connect()
+            return self.is_connected
+    
+    def _probe_nodes(self, node_urls: List[str], timeout: float) -> Optional[str]:
+        """
+        Probe the health endpoint of several nodes in parallel.
+        
+        Args:
+            node_urls: URLs of the nodes to probe
+            timeout: Per-probe timeout in seconds
+            
+        Returns:
+            URL of the first node that answered healthy, or None if none did
+        """
+        # Probes bypass _make_request, so send the auth headers explicitly
+        headers = {**self._default_headers, **self._auth_headers}
+        executor = ThreadPoolExecutor(max_workers=len(node_urls))
+        futures = {
+            executor.submit(self._session.get, f"{node_url}/health", headers=headers, timeout=timeout): node_url
+            for node_url in node_urls
+        }
+        
+        try:
+            for future in as_completed(futures):
+                node_url = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.warning(f"Error connecting to {node_url}: {str(e)}")
+                    self._mark_node_unhealthy(node_url)
+                    continue
+                
+                if response.status_code == 200:
+                    self._mark_node_healthy(node_url, time.time())
+                    return node_url
+                
+                logger.warning(f"Failed to connect to {node_url}: HTTP {response.status_code}")
+                self._mark_node_unhealthy(node_url)
+        finally:
+            # Don't wait on slower probes once a healthy node has been found
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return None
+    
+    def _backoff_delay(self, attempt: int, base_delay: float) -> float:
+        """
+        Compute a full-jitter exponential backoff delay.
+        
+        Randomizing over the whole window keeps concurrent callers from
+        retrying in lockstep against a recovering node.
+        
+        Args:
+            attempt: Zero-based attempt number
+            base_delay: Delay in seconds for the first attempt
+            
+        Returns:
+            Delay in seconds, capped at the configured retry cap
+        """
+        return random.uniform(0, min(self._retry_cap, base_delay * (2 ** attempt)))
+    
     def _make_request(self, url: str, method: str = 'GET', data: Optional[Dict[str, Any]] = None, 
-                     headers: Optional[Dict[str, str]] = None, timeout: float = 10.0) -> requests.Response:
+                     headers: Optional[Dict[str, str]] = None, timeout: float = 10.0,
+                     stream: bool = False) -> requests.Response:
         """
         Make an HTTP request with retry logic.
         
@@ -197,47 +428,36 @@ class IOTAConnection:
             data: Request data/payload
             headers: Request headers
             timeout: Request timeout in seconds
+            stream: Defer downloading the response body until it is read
             
         Returns:
             Response object
         """
-        # Set default headers
-        if headers is None:
-            headers = {
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            }
+        method = method.upper()
         
-        # Add authentication if configured
-        auth_config = self.config.get('authentication', {})
-        auth_type = auth_config.get('type', 'none')
+        headers = {**self._default_headers, **(headers or {}), **self._auth_headers}
         
-        if auth_type == 'api_key':
-            headers['X-API-Key'] = auth_config.get('api_key', '')
-        elif auth_type == 'bearer':
-            headers['Authorization'] = f"Bearer {auth_config.get('token', '')}"
+        # Mutating requests carry one idempotency key across all retries so the
+        # node can discard duplicates if a retry follows a lost response
+        is_mutating = method in ('POST', 'PUT', 'DELETE')
+        if is_mutating:
+            headers.setdefault('Idempotency-Key', uuid.uuid4().hex)
+        
+        # Encode the body once up front rather than on every attempt
+        body = _json_dumps(data) if data is not None else None
         
         # Set retry parameters
-        retry_count = self.config.get('retry_count', 3)
-        retry_delay = self.config.get('retry_delay', 1000) / 1000  # Convert to seconds
+        retry_count = self._retry_count if self._retry_on_mutating or not is_mutating else 0
         
         # Make request with retry logic
         for attempt in range(retry_count + 1):
+            delay = self._backoff_delay(attempt, self._retry_delay)
+            
             try:
-                if method.upper() == 'GET':
-                    response = requests.get(url, headers=headers, timeout=timeout)
-                elif method.upper() == 'POST':
-                    response = requests.post(url, json=data, headers=headers, timeout=timeout)
-                elif method.upper() == 'PUT':
-                    response = requests.put(url, json=data, headers=headers, timeout=timeout)
-                elif method.upper() == 'DELETE':
-                    response = requests.delete(url, json=data, headers=headers, timeout=timeout)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                # Return response if successful
-                return response
-            except Exception as e:
+                response = self._session.request(
+                    method, url, data=body, headers=headers, timeout=timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
                 logger.warning(f"Request attempt {attempt+1}/{retry_count+1} failed: {str(e)}")
                 
                 # If last attempt, re-raise exception
@@ -245,7 +465,68 @@ class IOTAConnection:
                     raise
                 
                 # Wait before retrying
-                time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
+                time.sleep(delay)
+                continue
+            
+            # Retry transient gateway/throttling errors, honouring Retry-After up
+            # to the retry cap so a long hint can't stall the calling thread
+            if response.status_code in (429, 502, 503, 504) and attempt < retry_count:
+                if response.status_code in (429, 503) and 'Retry-After' in response.headers:
+                    try:
+                        delay = min(self._retry_cap, max(delay, float(response.headers['Retry-After'])))
+                    except ValueError:
+                        pass
+                logger.warning(f"Request attempt {attempt+1}/{retry_count+1} failed: HTTP {response.status_code}")
+                # Hand the connection back to the pool before waiting; a streamed
+                # body is never read, so it would otherwise stay checked out
+                response.close()
+                time.sleep(delay)
+                continue
+            
+            # Return response if successful
+            return response
+    
+    def _json(self, response: requests.Response) -> Any:
+        """
+        Decode a JSON response body.
+        
+        Args:
+            response: Response object
+            
+        Returns:
+            Decoded JSON payload
+        """
+        return _json_loads(response.content)
+    
+    def _iter_outputs(self, response: requests.Response):
+        """
+        Iterate over the outputs in an address-outputs response.
+        
+        Payloads larger than the configured stream threshold are parsed
+        incrementally so the full UTXO list is never held in memory at once.
+        
+        Args:
+            response: Response object requested with stream=True
+            
+        Yields:
+            Output dictionaries
+        """
+        try:
+            content_length = int(response.headers.get('Content-Length') or 0)
+            
+            if ijson is not None and content_length > self._stream_threshold:
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, 'data.item', use_float=True)
+            else:
+                yield from self._json(response).get('data', [])
+        finally:
+            response.close()
+    
+    def close(self):
+        """
+        Close the pooled HTTP session and release its connections.
+        """
+        self._session.close()
     
     def _get_node_info(self) -> Dict[str, Any]:
         """
@@ -258,12 +539,19 @@ class IOTAConnection:
             logger.error("Not connected to IOTA network")
             return {}
         
+        node_url = self.nodes[self.current_node_index]
+        cache_key = f"info_{node_url}"
+        with self._cache_lock:
+            cached = self.cache['network_stats'].get(cache_key)
+        if cached is not None:
+            self.network_info = cached
+            return cached
+        
         try:
-            node_url = self.nodes[self.current_node_index]
             response = self._make_request(f"{node_url}/api/v2/info")
             
             if response.status_code == 200:
-                info = response.json()
+                info = self._json(response)
                 # Cache basic info
                 self.network_info = {
                     'node_url': node_url,
@@ -273,6 +561,9 @@ class IOTAConnection:
                     'latest_milestone': info.get('data', {}).get('latest_milestone_index', 0)
                 }
                 
+                with self._cache_lock:
+                    self.cache['network_stats'][cache_key] = self.network_info
+                
                 logger.info(f"Connected to {self.network_info['network']} network, node version: {self.network_info['version']}")
                 return self.network_info
             else:
@@ -282,6 +573,34 @@ class IOTAConnection:
             logger.error(f"Error getting node info: {str(e)}")
             return {}
     
+    @property
+    def node_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot of per-node health status keyed by node URL.
+        """
+        return {
+            node: {
+                'healthy': bool(self._node_healthy[i]),
+                'failure_count': int(self._node_failure_count[i]),
+                'last_check': float(self._node_last_check[i]),
+                'response_time': float(self._node_response_time[i])
+            }
+            for node, i in self._node_index.items()
+        }
+    
+    def _mark_node_healthy(self, node_url: str, now: float):
+        """
+        Mark a node as healthy and reset its failure count.
+        
+        Args:
+            node_url: URL of the node to mark
+            now: Time of the successful check
+        """
+        i = self._node_index[node_url]
+        self._node_healthy[i] = True
+        self._node_failure_count[i] = 0
+        self._node_last_check[i] = now
+    
     def _mark_node_unhealthy(self, node_url: str):
         """
         Mark a node as unhealthy and update its status.
@@ -289,14 +608,17 @@ class IOTAConnection:
         Args:
             node_url: URL of the node to mark
         """
-        if node_url in self.node_health:
-            self.node_health[node_url]['failure_count'] += 1
-            self.node_health[node_url]['last_check'] = time.time()
-            
-            # Mark as unhealthy after consistent failures
-            if self.node_health[node_url]['failure_count'] >= 3:
-                self.node_health[node_url]['healthy'] = False
-                logger.warning(f"Marked node {node_url} as unhealthy after {self.node_health[node_url]['failure_count']} failures")
+        i = self._node_index.get(node_url)
+        if i is None:
+            return
+        
+        self._node_failure_count[i] += 1
+        self._node_last_check[i] = time.time()
+        
+        # Mark as unhealthy after consistent failures
+        if self._node_failure_count[i] >= 3 and self._node_healthy[i]:
+            self._node_healthy[i] = False
+            logger.warning(f"Marked node {node_url} as unhealthy after {self._node_failure_count[i]} failures")
     
     def _switch_to_healthy_node(self) -> bool:
         """
@@ -306,30 +628,32 @@ class IOTAConnection:
             Success status
         """
         # Check if current node is unhealthy
-        current_node = self.nodes[self.current_node_index]
-        if self.node_health[current_node]['healthy']:
+        if self._node_healthy[self.current_node_index]:
             return True  # Current node is fine
         
-        # Find a healthy node
-        for i in range(len(self.nodes)):
-            next_index = (self.current_node_index + i + 1) % len(self.nodes)
-            next_node = self.nodes[next_index]
-            
-            if self.node_health[next_node]['healthy']:
-                self.current_node_index = next_index
-                logger.info(f"Switched to healthy node: {next_node}")
-                return True
-        
-        # If all nodes are unhealthy, try to reconnect to the least recently failed one
-        least_recent = min(self.node_health.items(), key=lambda x: x[1]['last_check'])
-        least_recent_node = least_recent[0]
-        least_recent_index = self.nodes.index(least_recent_node)
+        # Find the next healthy node in rotation order
+        node_count = len(self.nodes)
+        rotation = (self.current_node_index + 1 + np.arange(node_count)) % node_count
+        healthy = rotation[self._node_healthy[rotation]]
         
-        self.current_node_index = least_recent_index
-        logger.info(f"All nodes unhealthy, trying least recent: {least_recent_node}")
+        if healthy.size:
+            self.current_node_index = int(healthy[0])
+            logger.info(f"Switched to healthy node: {self.nodes[self.current_node_index]}")
+            return True
         
-        # Attempt to reconnect
-        return self._connect()
+        # If all nodes are unhealthy, reconnect under the same lock as
+        # ensure_connected so a failover and a lazy connect can't both probe
+        with self._connect_lock:
+            # Another caller may have reconnected while we waited
+            if self._node_healthy[self.current_node_index]:
+                return self.is_connected
+            
+            # Try to reconnect to the least recently failed node
+            self.current_node_index = int(np.argmin(self._node_last_check))
+            logger.info(f"All nodes unhealthy, trying least recent: {self.nodes[self.current_node_index]}")
+            
+            # Attempt to reconnect
+            return self._connect()
     
     def _check_health(self) -> bool:
         """
@@ -340,26 +664,22 @@ class IOTAConnection:
         """
         if not self.is_connected:
             # Try to connect
-            return self._connect()
+            return self.ensure_connected()
         
         # Only check health periodically
-        now = time.time()
-        health_check_interval = self.config.get('monitoring', {}).get('health_check_interval', 300)
-        
-        if now - self.last_health_check < health_check_interval:
+        now_ns = time.monotonic_ns()
+        if self.last_health_check is not None and now_ns - self.last_health_check < self._health_check_interval_ns:
             return self.is_connected
         
-        self.last_health_check = now
+        self.last_health_check = now_ns
+        now = time.time()
         
         try:
             node_url = self.nodes[self.current_node_index]
             response = self._make_request(f"{node_url}/health", timeout=5.0)
             
             if response.status_code == 200:
-                # Update node health
-                self.node_health[node_url]['healthy'] = True
-                self.node_health[node_url]['failure_count'] = 0
-                self.node_health[node_url]['last_check'] = now
+                self._mark_node_healthy(node_url, now)
                 
                 self.health_check_count += 1
                 logger.debug(f"Health check passed for {node_url}")
@@ -385,13 +705,20 @@ class IOTAConnection:
         """
         # Check cache first
         cache_key = f"address_{address}"
-        if cache_key in self.cache['address_data']:
-            cache_entry = self.cache['address_data'][cache_key]
-            max_age = self.config.get('max_cache_age', 300)
-            
-            if time.time() - cache_entry['timestamp'] < max_age:
-                logger.info(f"Using cached data for address {address}")
-                return cache_entry['data']
+        with self._cache_lock:
+            cached = self.cache['address_data'].get(cache_key)
+            validator = self._address_validators.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached data for address {address}")
+            return cached
+        
+        # Revalidate previously fetched data instead of re-downloading it
+        conditional_headers = {}
+        if validator is not None:
+            if validator['etag']:
+                conditional_headers['If-None-Match'] = validator['etag']
+            if validator['last_modified']:
+                conditional_headers['If-Modified-Since'] = validator['last_modified']
         
         # Check connection health
         if not self._check_health():
@@ -403,18 +730,32 @@ class IOTAConnection:
         try:
             # Get address outputs (balance data)
             node_url = self.nodes[self.current_node_index]
-            response = self._make_request(f"{node_url}/api/v2/addresses/{address}/outputs")
+            response = self._make_request(
+                f"{node_url}/api/v2/addresses/{address}/outputs",
+                headers=conditional_headers,
+                stream=True
+            )
+            
+            if response.status_code == 304 and validator is not None:
+                logger.info(f"Address data for {address} not modified")
+                response.close()
+                with self._cache_lock:
+                    self.cache['address_data'][cache_key] = validator['data']
+                return validator['data']
             
             if response.status_code != 200:
                 logger.warning(f"Failed to get address outputs: HTTP {response.status_code}")
+                response.close()
                 return {"error": f"Failed to get address data: HTTP {response.status_code}"}
             
-            outputs = response.json().get('data', [])
+            outputs = self._iter_outputs(response)
             
             # Calculate basic address data
             total_balance = 0
             native_tokens = []
             transactions = []
+            first_timestamp = math.inf
+            latest_timestamp = -math.inf
             
             for output in outputs:
                 # Extract balance
@@ -436,7 +777,7 @@ class IOTAConnection:
                 
                 # Extract transaction data
                 if 'metadata' in output:
-                    tx_timestamp = output['metadata'].get('timestamp')
+                    tx_timestamp = _to_epoch_seconds(output['metadata'].get('timestamp'))
                     transaction_id = output['metadata'].get('transaction_id')
                     
                     if transaction_id:
@@ -451,6 +792,13 @@ class IOTAConnection:
                             'tag': output.get('tag'),
                             'metadata': output.get('metadata', {})
                         })
+                        
+                        # Track the activity window while iterating
+                        if tx_timestamp is not None:
+                            if tx_timestamp < first_timestamp:
+                                first_timestamp = tx_timestamp
+                            if tx_timestamp > latest_timestamp:
+                                latest_timestamp = tx_timestamp
             
             # Get additional transaction history beyond outputs
             # This would require additional API calls in a real implementation
@@ -461,23 +809,64 @@ class IOTAConnection:
                 'balance': total_balance,
                 'nativeTokens': native_tokens,
                 'transactions': transactions,
-                'firstTransactionTimestamp': min([tx['timestamp'] for tx in transactions]) if transactions else None,
-                'latestTransactionTimestamp': max([tx['timestamp'] for tx in transactions]) if transactions else None,
+                'firstTransactionTimestamp': first_timestamp if first_timestamp != math.inf else None,
+                'latestTransactionTimestamp': latest_timestamp if latest_timestamp != -math.inf else None,
                 'messageCount': len(transactions),
                 'timestamp': time.time()
             }
             
-            # Cache the result
-            self.cache['address_data'][cache_key] = {
-                'data': address_data,
-                'timestamp': time.time()
-            }
+            # Cache the result along with its validators
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            with self._cache_lock:
+                self.cache['address_data'][cache_key] = address_data
+                if etag or last_modified:
+                    self._address_validators[cache_key] = {
+                        'data': address_data,
+                        'etag': etag,
+                        'last_modified': last_modified
+                    }
             
             return address_data
         except Exception as e:
             logger.error(f"Error getting address data: {str(e)}")
             return {"error": f"Error getting address data: {str(e)}"}
     
+    def get_address_data_batch(self, addresses: List[str], max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Get data for several IOTA addresses, fetching cache misses concurrently.
+        
+        Args:
+            addresses: IOTA addresses to query (duplicates are fetched once)
+            max_workers: Maximum number of concurrent node requests
+            
+        Returns:
+            Dictionary mapping each address to its address data
+        """
+        results = {}
+        misses = []
+        
+        # Serve what we can from the cache
+        with self._cache_lock:
+            for address in dict.fromkeys(addresses):
+                cached = self.cache['address_data'].get(f"address_{address}")
+                if cached is not None:
+                    results[address] = cached
+                else:
+                    misses.append(address)
+        
+        if not misses:
+            return results
+        
+        logger.info(f"Fetching data for {len(misses)} addresses ({len(results)} cached)")
+        
+        # Fetch the remaining addresses over the pooled session in parallel
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+            for address, address_data in zip(misses, executor.map(self.get_address_data, misses)):
+                results[address] = address_data
+        
+        return results
+    
     def get_token_price_history(self, token: str, days: int = 30) -> List[Dict[str, Any]]:
         """
         Get price history for a token.
@@ -491,13 +880,11 @@ class IOTAConnection:
         """
         # Check cache first
         cache_key = f"price_{token}_{days}"
-        if cache_key in self.cache['token_prices']:
-            cache_entry = self.cache['token_prices'][cache_key]
-            max_age = self.config.get('max_cache_age', 300)
-            
-            if time.time() - cache_entry['timestamp'] < max_age:
-                logger.info(f"Using cached price data for {token}")
-                return cache_entry['data']
+        with self._cache_lock:
+            cached = self.cache['token_prices'].get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached price data for {token}")
+            return cached
         
         logger.info(f"Fetching price history for {token} ({days} days)")
         
@@ -510,33 +897,21 @@ class IOTAConnection:
             base_price = token_config.get('base_price', 1.0)
             volatility = token_config.get('volatility', 0.02)
             
-            # Generate simulated price history
-            now = datetime.now()
-            price_history = []
-            
-            # Start with current price
-            current_price = base_price
+            # Generate simulated price history as a random walk in one vectorized pass
+            now = int(time.time())
+            price_changes = self._rng.normal(0.0, volatility, size=days)
+            prices = base_price * np.cumprod(1.0 + price_changes)
+            volumes = self._rng.integers(1000000, 10000000, size=days)
+            timestamps = now - 86400 * np.arange(days - 1, -1, -1)
             
-            for i in range(days):
-                # Calculate date for this point
-                date = now - timedelta(days=days-i-1)
-                
-                # Add some random price movement
-                price_change = np.random.normal(0, volatility)
-                current_price *= (1 + price_change)
-                
-                # Add to history
-                price_history.append({
-                    'timestamp': int(date.timestamp()),
-                    'price': current_price,
-                    'volume': np.random.randint(1000000, 10000000)
-                })
+            price_history = [
+                {'timestamp': timestamp, 'price': price, 'volume': volume}
+                for timestamp, price, volume in zip(timestamps.tolist(), prices.tolist(), volumes.tolist())
+            ]
             
             # Cache the result
-            self.cache['token_prices'][cache_key] = {
-                'data': price_history,
-                'timestamp': time.time()
-            }
+            with self._cache_lock:
+                self.cache['token_prices'][cache_key] = price_history
             
             return price_history
         except Exception as e:
@@ -553,124 +928,204 @@ class IOTAConnection:
         Returns:
             Token configuration
         """
-        # Define token configurations
-        token_configs = {
-            'IOTA': {
-                'base_price': 0.25,
-                'volatility': 0.025
-            },
-            'ETH': {
-                'base_price': 2000.0,
-                'volatility': 0.02
-            },
-            'BTC': {
-                'base_price': 40000.0,
-                'volatility': 0.018
-            },
-            'USDC': {
-                'base_price': 1.0,
-                'volatility': 0.001
-            },
-            'DAI': {
-                'base_price': 1.0,
-                'volatility': 0.001
-            }
-        }
-        
-        return token_configs.get(token.upper(), {
-            'base_price': 1.0,
-            'volatility': 0.02
-        })
+        return _token_config(token.upper())
     
-    def get_iota_feature_vector(self, iota_address: str, eth_address: Optional[str] = None) -> Dict[str, Any]:
+    def get_iota_features(self, iota_address: str, address_data: Optional[Dict[str, Any]] = None,
+                          now: Optional[float] = None) -> Optional[IOTAFeatures]:
         """
-        Get a feature vector for AI analysis based on IOTA address data.
+        Compute the numeric IOTA features for an address.
         
         Args:
             iota_address: IOTA address to analyze
-            eth_address: Related Ethereum address (optional)
+            address_data: Previously fetched address data (fetched if omitted)
+            now: Reference epoch seconds for activity ages (current time if omitted)
             
         Returns:
-            Feature vector dictionary
+            IOTAFeatures tuple, or None if the address data could not be fetched
         """
-        logger.info(f"Generating feature vector for IOTA address {iota_address}")
+        if now is None:
+            now = time.time()
         
         # Get address data
-        address_data = self.get_address_data(iota_address)
+        if address_data is None:
+            address_data = self.get_address_data(iota_address)
         
         if 'error' in address_data:
             logger.warning(f"Error getting address data: {address_data['error']}")
-            return {}
+            return None
         
-        # Extract features
-        features = {}
-        
-        # Basic features
-        features['iota_address'] = iota_address
-        features['iota_balance'] = address_data.get('balance', 0)
-        features['iota_transaction_count'] = len(address_data.get('transactions', []))
-        features['iota_message_count'] = address_data.get('messageCount', 0)
-        features['iota_native_tokens_count'] = len(address_data.get('nativeTokens', []))
+        transactions = address_data.get('transactions', [])
         
         # Calculate first activity days (days since first transaction)
         if address_data.get('firstTransactionTimestamp'):
-            first_tx_time = datetime.fromtimestamp(address_data['firstTransactionTimestamp'])
-            days_since_first = (datetime.now() - first_tx_time).days
-            features['iota_first_activity_days'] = days_since_first
+            first_activity_days = int((now - address_data['firstTransactionTimestamp']) // 86400)
         else:
-            features['iota_first_activity_days'] = 0
+            first_activity_days = 0
         
         # Process transactions for more features
-        transactions = address_data.get('transactions', [])
-        
         if transactions:
-            # Sort by timestamp
-            transactions.sort(key=lambda x: x.get('timestamp', 0))
+            tx_count = len(transactions)
             
-            # Calculate regularity
-            timestamps = [tx.get('timestamp', 0) for tx in transactions]
-            
-            if len(timestamps) >= 2:
-                # Calculate intervals between transactions
-                intervals = np.diff(timestamps)
-                
-                # Calculate coefficient of variation (lower means more regular)
-                mean_interval = np.mean(intervals)
-                if mean_interval > 0:
-                    std_interval = np.std(intervals)
-                    cv = std_interval / mean_interval
-                    
-                    # Transform to 0-1 scale (1 is most regular)
-                    features['iota_activity_regularity'] = 1.0 / (1.0 + cv)
-                else:
-                    features['iota_activity_regularity'] = 0.5
-            else:
-                features['iota_activity_regularity'] = 0.5
+            # Build column arrays once and compute all statistics vectorized
+            timestamps = np.fromiter((tx.get('timestamp') or 0 for tx in transactions), dtype=np.int64, count=tx_count)
+            timestamps.sort()
+            incoming = np.fromiter((bool(tx.get('incoming', False)) for tx in transactions), dtype=bool, count=tx_count)
+            cross_layer = np.fromiter((tx.get('tag') == 'CROSS_LAYER_TRANSFER' for tx in transactions), dtype=bool, count=tx_count)
             
-            # Count cross-layer transfers
-            cross_layer_count = sum(1 for tx in transactions if tx.get('tag') == 'CROSS_LAYER_TRANSFER')
-            features['cross_layer_transfers'] = cross_layer_count
+            # Calculate regularity from intervals between transactions
+            intervals = np.diff(timestamps)
+            mean_interval = intervals.mean() if intervals.size else 0.0
             
-            # Calculate incoming ratio
-            incoming_count = sum(1 for tx in transactions if tx.get('incoming', False))
-            if transactions:
-                features['incoming_transaction_ratio'] = incoming_count / len(transactions)
+            if mean_interval > 0:
+                # Coefficient of variation (lower means more regular), transformed to 0-1 scale
+                cv = intervals.std() / mean_interval
+                activity_regularity = float(1.0 / (1.0 + cv))
             else:
-                features['incoming_transaction_ratio'] = 0.5
+                activity_regularity = 0.5
+            
+            # Count cross-layer transfers and incoming ratio
+            cross_layer_transfers = int(cross_layer.sum())
+            incoming_ratio = float(incoming.sum()) / tx_count
         else:
             # Default values if no transactions
-            features['iota_activity_regularity'] = 0.5
-            features['cross_layer_transfers'] = 0
-            features['incoming_transaction_ratio'] = 0.5
+            activity_regularity = 0.5
+            cross_layer_transfers = 0
+            incoming_ratio = 0.5
+        
+        return IOTAFeatures(
+            iota_balance=address_data.get('balance', 0),
+            iota_transaction_count=len(transactions),
+            iota_message_count=address_data.get('messageCount', 0),
+            iota_native_tokens_count=len(address_data.get('nativeTokens', [])),
+            iota_first_activity_days=first_activity_days,
+            iota_activity_regularity=activity_regularity,
+            cross_layer_transfers=cross_layer_transfers,
+            incoming_transaction_ratio=incoming_ratio
+        )
+    
+    def get_iota_feature_vector(self, iota_address: str, eth_address: Optional[str] = None,
+                                address_data: Optional[Dict[str, Any]] = None,
+                                now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get a feature vector for AI analysis based on IOTA address data.
+        
+        Args:
+            iota_address: IOTA address to analyze
+            eth_address: Related Ethereum address (optional)
+            address_data: Previously fetched address data (fetched if omitted)
+            now: Reference epoch seconds for activity ages (current time if omitted)
+            
+        Returns:
+            Feature vector dictionary
+        """
+        logger.info(f"Generating feature vector for IOTA address {iota_address}")
+        
+        features = self.get_iota_features(iota_address, address_data=address_data, now=now)
+        if features is None:
+            return {}
+        
+        feature_vector = {'iota_address': iota_address}
+        feature_vector.update(features._asdict())
+        return feature_vector
+    
+    async def get_iota_feature_vector_async(self, iota_address: str, eth_address: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a feature vector without blocking the event loop.
+        
+        The blocking request path runs in the default executor so callers can
+        gather it with other coroutines.
+        
+        Args:
+            iota_address: IOTA address to analyze
+            eth_address: Related Ethereum address (optional)
+            
+        Returns:
+            Feature vector dictionary
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_iota_feature_vector, iota_address, eth_address)
+    
+    async def get_iota_feature_vectors_async(self, iota_addresses: List[str],
+                                             max_concurrency: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Get feature vectors for several addresses concurrently.
+        
+        Args:
+            iota_addresses: IOTA addresses to analyze (duplicates are fetched once)
+            max_concurrency: Maximum number of feature vectors built at once
+            
+        Returns:
+            Dictionary mapping each address to its feature vector
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(address: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_iota_feature_vector_async(address)
+        
+        addresses = list(dict.fromkeys(iota_addresses))
+        results = await asyncio.gather(*(fetch(address) for address in addresses))
+        return dict(zip(addresses, results))
+    
+    def get_iota_feature_vector_batch(self, iota_addresses: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Get IOTA features for several addresses as a fixed-schema matrix.
+        
+        Args:
+            iota_addresses: IOTA addresses to analyze
+            
+        Returns:
+            Tuple of (addresses with features, float32 matrix of shape (N, len(FEATURE_ORDER)))
+        """
+        # Fetch all address data concurrently, then reuse it for feature extraction
+        address_data = self.get_address_data_batch(iota_addresses)
+        
+        addresses = []
+        matrix = np.empty((len(address_data), len(FEATURE_ORDER)), dtype=np.float32)
+        now = time.time()
+        
+        for address in dict.fromkeys(iota_addresses):
+            features = self.get_iota_features(address, address_data=address_data[address], now=now)
+            if features is None:
+                continue
+            
+            # IOTAFeatures is already in column order, so it fills the row directly
+            matrix[len(addresses)] = features
+            addresses.append(address)
+        
+        return addresses, matrix[:len(addresses)]
+    
+    def get_iota_feature_frame(self, iota_addresses: List[str]) -> pd.DataFrame:
+        """
+        Get IOTA features for several addresses as a DataFrame for model scoring.
         
-        # Add more advanced features
-        # These would involve more sophisticated analysis in a real implementation
+        The frame wraps the float32 batch matrix without copying it, so it can be
+        passed straight to scikit-learn/XGBoost models.
         
-        return features
+        Args:
+            iota_addresses: IOTA addresses to analyze
+            
+        Returns:
+            DataFrame indexed by address with one column per FEATURE_ORDER entry
+        """
+        addresses, matrix = self.get_iota_feature_vector_batch(iota_addresses)
+        return pd.DataFrame(
+            matrix,
+            index=pd.Index(addresses, name='iota_address'),
+            columns=list(FEATURE_ORDER),
+            copy=False
+        )
+
+# Shared connection instances keyed by config path
+_iota_connections: Dict[str, IOTAConnection] = {}
+_iota_connections_lock = threading.Lock()
 
 def get_iota_connection(config_path: str = 'config/iota_connection_config.json') -> IOTAConnection:
     """
-    Get an IOTA connection instance.
+    Get the shared IOTA connection instance for a configuration.
+    
+    Connections are created once per config path so callers share the pooled
+    session, caches and node health state.
     
     Args:
         config_path: Path to configuration file
@@ -678,7 +1133,25 @@ def get_iota_connection(config_path: str = 'config/iota_connection_config.json')
     Returns:
         IOTAConnection instance
     """
-    return IOTAConnection(config_path)
+    connection = _iota_connections.get(config_path)
+    if connection is not None:
+        return connection
+    
+    # Re-check under the lock so concurrent first callers build only one instance
+    with _iota_connections_lock:
+        connection = _iota_connections.get(config_path)
+        if connection is None:
+            connection = _iota_connections[config_path] = IOTAConnection(config_path)
+        return connection
+
+def reset_iota_connection():
+    """
+    Close and discard all shared IOTA connection instances.
+    """
+    with _iota_connections_lock:
+        for connection in _iota_connections.values():
+            connection.close()
+        _iota_connections.clear()
 
 # Test function
 if __name__ == "__main__":
@@ -693,7 +1166,7 @@ if __name__ == "__main__":
     connection = IOTAConnection(args.config)
     
     # Print connection status
-    print(f"Connected to IOTA network: {connection.is_connected}")
+    print(f"Connected to IOTA network: {connection.ensure_connected()}")
     
     # Test address data if provided
     if args.address:
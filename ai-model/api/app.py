@@ -8,12 +8,22 @@ allowing seamless integration between the Node.js backend and Python ML models.
 import os
 import sys
 import json
+import queue
 import logging
-from flask import Flask, request, jsonify, Response
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import Flask, request, Response
 from flask_cors import CORS
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional
 import numpy as np
 import time
-import traceback
+
+# orjson serializes responses (including NumPy values) much faster than jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -37,9 +47,179 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize risk model
+# Risk model, loaded once at startup by the entry point (wsgi.py or __main__);
+# handlers fall back to the rule-based paths if it failed to load
 risk_model = None
 
+# Risk points contributed by the simulated asset (-10 to +10); other assets are neutral
+_ASSET_IMPACT = {
+    'usdt': -5,  # Stablecoins are less risky
+    'dai': -5,
+    'eth': 5,  # Major cryptos have moderate risk
+    'btc': 5,
+    'smr': -10  # IOTA's Shimmer has lower risk on this platform
+}
+
+# Request bodies, validated once per request instead of ad-hoc key checks
+class RiskAssessmentRequest(BaseModel):
+    """Risk assessment payload; extra metrics are passed through to the model."""
+    address: str = Field(..., description="Ethereum address to assess")
+    iota_address: Optional[str] = Field(None, description="IOTA address to include in assessment")
+
+class SimulationParams(BaseModel):
+    """Parameters for a risk simulation."""
+    collateralAmount: float = Field(1000, description="Amount of collateral")
+    borrowAmount: float = Field(500, description="Amount borrowed")
+    asset: str = Field('smr', description="Asset type (e.g., 'smr', 'iota', 'eth')")
+    useIOTA: bool = Field(False, description="Whether IOTA is being used")
+    crossChainActivity: bool = Field(False, description="Whether cross-chain activity exists")
+    identityVerified: bool = Field(False, description="Whether identity is verified")
+
+class Scenario(SimulationParams):
+    """A named simulation for scenario analysis."""
+    name: str = Field('Unnamed Scenario', description="Scenario name")
+
+class ScenarioAnalysisRequest(BaseModel):
+    """Scenario analysis payload."""
+    scenarios: List[Scenario]
+
+def _model_dict(model, **kwargs):
+    """Dump a validated model to a dict on pydantic v1 or v2."""
+    if hasattr(model, 'model_dump'):
+        return model.model_dump(**kwargs)
+    return model.dict(**kwargs)
+
+def _validation_error_response(error):
+    """400 response for a request body that failed validation."""
+    return _json_response({"error": "Invalid request", "message": str(error)}, 400)
+
+def _risk_kernel(collateral_amount, collateral_ratio, asset, use_iota, cross_chain_activity, identity_verified):
+    """
+    Score a simulated position with the fallback rules (similar to frontend implementation).
+    
+    Returns:
+        Tuple of (risk_score, liquidation_risk, interest_rate, max_borrow_amount,
+        collateral_ratio_impact, asset_impact, iota_impact, cross_chain_impact, identity_impact)
+    """
+    # Collateral ratio factor (-20 to +30 points)
+    collateral_ratio_impact = 0
+    if collateral_ratio >= 2.0:
+        collateral_ratio_impact = -20  # Very good ratio
+    elif collateral_ratio >= 1.5:
+        collateral_ratio_impact = -10  # Good ratio
+    elif collateral_ratio < 1.2:
+        collateral_ratio_impact = 20  # Dangerous ratio
+    elif collateral_ratio < 1.3:
+        collateral_ratio_impact = 10  # Risky ratio
+    
+    # Asset factor (-10 to +10 points)
+    asset_impact = _ASSET_IMPACT.get(asset, 0)
+    
+    # IOTA usage (-15 to 0), cross-chain activity (-10 to 0) and identity verification (-15 to 0)
+    iota_impact = -15 if use_iota else 0
+    cross_chain_impact = -10 if cross_chain_activity else 0
+    identity_impact = -15 if identity_verified else 0
+    
+    # Start at medium risk and keep the score between 0 and 100
+    risk_score = 50 + collateral_ratio_impact + asset_impact + iota_impact + cross_chain_impact + identity_impact
+    risk_score = max(0, min(100, risk_score))
+    
+    # Liquidation risk, interest rate based on risk score, and max borrowing power
+    liquidation_risk = max(0, min(100, 100 - (collateral_ratio * 50)))
+    interest_rate = 3 + (risk_score / 10)
+    max_borrow_amount = collateral_amount * 0.8
+    
+    return (risk_score, liquidation_risk, interest_rate, max_borrow_amount,
+            collateral_ratio_impact, asset_impact, iota_impact, cross_chain_impact, identity_impact)
+
+def _risk_kernel_batch(collateral_amount, borrow_amount, asset_impact, use_iota, cross_chain_activity, identity_verified):
+    """
+    Vectorized _risk_kernel over arrays of scenarios (one element per scenario).
+    
+    Returns:
+        Tuple of arrays in the same order as _risk_kernel, with collateral_ratio first
+    """
+    collateral_ratio = np.divide(collateral_amount, borrow_amount,
+                                 out=np.full(collateral_amount.shape, np.inf), where=borrow_amount > 0)
+    
+    collateral_ratio_impact = np.select(
+        [collateral_ratio >= 2.0, collateral_ratio >= 1.5, collateral_ratio < 1.2, collateral_ratio < 1.3],
+        [-20, -10, 20, 10],
+        default=0
+    )
+    iota_impact = np.where(use_iota, -15, 0)
+    cross_chain_impact = np.where(cross_chain_activity, -10, 0)
+    identity_impact = np.where(identity_verified, -15, 0)
+    
+    risk_score = np.clip(50 + collateral_ratio_impact + asset_impact + iota_impact + cross_chain_impact + identity_impact, 0, 100)
+    liquidation_risk = np.clip(100 - (collateral_ratio * 50), 0, 100)
+    interest_rate = 3 + (risk_score / 10)
+    max_borrow_amount = collateral_amount * 0.8
+    
+    return (collateral_ratio, risk_score, liquidation_risk, interest_rate, max_borrow_amount,
+            collateral_ratio_impact, asset_impact, iota_impact, cross_chain_impact, identity_impact)
+
+def _simulation_result(collateral_ratio, asset, use_iota, cross_chain_activity, identity_verified, scores):
+    """Build the simulate-risk response from _risk_kernel output."""
+    (risk_score, liquidation_risk, interest_rate, max_borrow_amount,
+     collateral_ratio_impact, asset_impact, iota_impact, cross_chain_impact, identity_impact) = scores
+    
+    return {
+        "riskScore": round(risk_score),
+        "collateralRatio": collateral_ratio,
+        "liquidationRisk": round(liquidation_risk),
+        "interestRate": round(interest_rate * 100) / 100,
+        "maxBorrowAmount": round(max_borrow_amount * 100) / 100,
+        "factors": [
+            {
+                "name": "Collateral Ratio",
+                "impact": collateral_ratio_impact,
+                "description": f"{collateral_ratio:.2f}x ratio {'decreases' if collateral_ratio_impact <= 0 else 'increases'} risk"
+            },
+            {
+                "name": "Asset Selection",
+                "impact": asset_impact,
+                "description": f"{asset.upper()} {'decreases' if asset_impact <= 0 else 'increases'} risk"
+            },
+            {
+                "name": "IOTA Integration",
+                "impact": iota_impact,
+                "description": "IOTA usage lowers risk" if use_iota else "No IOTA integration"
+            },
+            {
+                "name": "Cross-Chain Activity",
+                "impact": cross_chain_impact,
+                "description": "Cross-chain activity lowers risk" if cross_chain_activity else "No cross-chain activity"
+            },
+            {
+                "name": "Identity Verification",
+                "impact": identity_impact,
+                "description": "Verified identity lowers risk" if identity_verified else "No identity verification"
+            }
+        ]
+    }
+
+def _simulate_risk_batch(params_list):
+    """Run the fallback simulation for many scenarios with one set of array operations."""
+    count = len(params_list)
+    collateral_amount = np.fromiter((p["collateralAmount"] for p in params_list), dtype=np.float64, count=count)
+    borrow_amount = np.fromiter((p["borrowAmount"] for p in params_list), dtype=np.float64, count=count)
+    asset_impact = np.fromiter((_ASSET_IMPACT.get(p["asset"], 0) for p in params_list), dtype=np.int64, count=count)
+    use_iota = np.fromiter((bool(p["useIOTA"]) for p in params_list), dtype=bool, count=count)
+    cross_chain_activity = np.fromiter((bool(p["crossChainActivity"]) for p in params_list), dtype=bool, count=count)
+    identity_verified = np.fromiter((bool(p["identityVerified"]) for p in params_list), dtype=bool, count=count)
+    
+    columns = _risk_kernel_batch(collateral_amount, borrow_amount, asset_impact,
+                                 use_iota, cross_chain_activity, identity_verified)
+    
+    # Back to Python scalars once, then build the responses in a single pass
+    collateral_ratios, *scores = (column.tolist() for column in columns)
+    return [
+        _simulation_result(collateral_ratio, params["asset"], params["useIOTA"],
+                           params["crossChainActivity"], params["identityVerified"], row_scores)
+        for params, collateral_ratio, *row_scores in zip(params_list, collateral_ratios, *scores)
+    ]
+
 def initialize_model():
     """Initialize the risk assessment model"""
     global risk_model
@@ -49,54 +229,242 @@ def initialize_model():
         logger.info("Risk model initialized successfully")
         return True
     except Exception as e:
-        logger.error(f"Error initializing risk model: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error initializing risk model: {e}")
         return False
 
+def _json_response(payload, status=200):
+    """Serialize a payload to a JSON response, with orjson when available."""
+    if orjson is not None:
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(payload)
+    return Response(body, status=status, mimetype='application/json')
+
+class _RiskAssessmentBatcher:
+    """
+    Groups concurrent risk assessment requests into batches for the shared model.
+    
+    A batch is dispatched once it reaches max_batch_size requests or max_delay
+    seconds after its first request arrived, whichever comes first. Callers
+    wait at most result_timeout seconds (the batching delay plus the
+    inference budget) for their assessment.
+    """
+    
+    def __init__(self, max_batch_size, max_delay, inference_timeout):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.result_timeout = max_delay + inference_timeout
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def submit(self, data):
+        """Queue a request and return a Future for its assessment."""
+        # Start the worker lazily so it runs in the serving process (after any fork)
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="risk-batcher", daemon=True)
+                    self._worker.start()
+        
+        future = Future()
+        self._queue.put((data, future))
+        return future
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                assessments = risk_model.assess_risk_batch([data for data, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), assessment in zip(batch, assessments):
+                    future.set_result(assessment)
+
+_risk_batcher = _RiskAssessmentBatcher(
+    max_batch_size=int(os.environ.get('AI_BATCH_SIZE', 16)),
+    max_delay=int(os.environ.get('AI_BATCH_WAIT_MS', 20)) / 1000,
+    inference_timeout=int(os.environ.get('AI_INFERENCE_TIMEOUT_MS', 10000)) / 1000
+)
+
+# Model simulations spend most of their time in NumPy, which releases the GIL,
+# so larger scenario sets are scored in parallel; small ones skip the pool.
+# The pool is only built the first time a model simulation needs it
+_simulation_pool = None
+_simulation_pool_lock = threading.Lock()
+_PARALLEL_SCENARIO_THRESHOLD = 4
+
+def _get_simulation_pool():
+    """Return the shared simulation thread pool, creating it on first use."""
+    global _simulation_pool
+    if _simulation_pool is None:
+        with _simulation_pool_lock:
+            if _simulation_pool is None:
+                _simulation_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='simulate-risk')
+    return _simulation_pool
+
+# Simulated model metrics. In a real implementation, these would be calculated
+# from historical data and from the model
+_MODEL_PERFORMANCE = {
+    "accuracy": 0.87,
+    "precision": 0.85,
+    "recall": 0.90,
+    "f1Score": 0.87,
+    "totalSamples": 1000,
+    "correctPredictions": 870,
+    "truePositives": 450,
+    "falsePositives": 80,
+    "trueNegatives": 420,
+    "falseNegatives": 50,
+    "confusionMatrix": [
+        [450, 80],  # [TP, FP]
+        [50, 420]   # [FN, TN]
+    ],
+    "riskBucketAccuracy": {
+        "veryLow": 0.95,
+        "low": 0.90,
+        "medium": 0.85,
+        "high": 0.80,
+        "veryHigh": 0.75
+    },
+    "defaultRate": 0.05,
+    "riskBins": [
+        {"score": "0-20", "count": 150, "defaultRate": 0.01},
+        {"score": "21-40", "count": 250, "defaultRate": 0.02},
+        {"score": "41-60", "count": 300, "defaultRate": 0.05},
+        {"score": "61-80", "count": 200, "defaultRate": 0.08},
+        {"score": "81-100", "count": 100, "defaultRate": 0.15}
+    ]
+}
+
+_FEATURE_IMPORTANCE = [
+    {"feature": "transaction_count", "importance": 0.15, "description": "Number of transactions"},
+    {"feature": "balance", "importance": 0.12, "description": "Account balance"},
+    {"feature": "activity_regularity", "importance": 0.11, "description": "Regularity of user activity"},
+    {"feature": "cross_layer_transfers", "importance": 0.10, "description": "Cross-layer transaction activity"},
+    {"feature": "identity_verification", "importance": 0.09, "description": "Identity verification status"},
+    {"feature": "wallet_balance", "importance": 0.08, "description": "Wallet balance"},
+    {"feature": "collateral_ratio", "importance": 0.07, "description": "Ratio of collateral to borrows"},
+    {"feature": "native_tokens_count", "importance": 0.06, "description": "Number of different tokens held"},
+    {"feature": "first_activity_days", "importance": 0.05, "description": "Days since first activity"},
+    {"feature": "message_count", "importance": 0.04, "description": "Number of messages sent"}
+]
+
+def _json_prefix(payload):
+    """Serialize a static payload once, leaving the object open for a lastUpdate field."""
+    return json.dumps(payload, separators=(',', ':'))[:-1].encode('utf-8')
+
+# Pre-serialized bodies; only lastUpdate changes between requests
+_MODEL_PERFORMANCE_JSON = _json_prefix(_MODEL_PERFORMANCE)
+_FEATURE_IMPORTANCE_JSON = _json_prefix({"features": _FEATURE_IMPORTANCE, "modelVersion": "v2.0"})
+
+# Simulated recommendations. In a real implementation, these would be derived
+# from the model
+_RECOMMENDATIONS = [
+    {
+        "title": "Increase Collateral Ratio",
+        "description": "Adding more collateral will reduce your risk score and improve borrowing terms.",
+        "impact": "high",
+        "actionType": "depositCollateral"
+    },
+    {
+        "title": "Complete Identity Verification",
+        "description": "Verify your identity using IOTA Identity to get better borrowing rates.",
+        "impact": "high",
+        "actionType": "verifyIdentity"
+    },
+    {
+        "title": "Increase IOTA Network Activity",
+        "description": "More transactions on the IOTA network will improve your on-chain reputation.",
+        "impact": "medium",
+        "actionType": "increaseActivity"
+    },
+    {
+        "title": "Try Cross-Layer Transfers",
+        "description": "Demonstrate blockchain expertise by using both L1 and L2 layers.",
+        "impact": "medium",
+        "actionType": "crossLayerTransfer"
+    },
+    {
+        "title": "Balance Asset Distribution",
+        "description": "Diversify your assets across multiple token types for better risk profile.",
+        "impact": "low",
+        "actionType": "diversifyAssets"
+    }
+]
+_RECOMMENDATIONS_JSON = json.dumps(_RECOMMENDATIONS, separators=(',', ':')).encode('utf-8')
+
+def _static_json_response(prefix):
+    """Complete a pre-serialized body with the current lastUpdate timestamp."""
+    return Response(prefix + b',"lastUpdate":%d}' % int(time.time()), mimetype='application/json')
+
+# Pre-serialized 500 bodies, so failing requests only encode the error message
+_MAX_ERROR_MESSAGE_LENGTH = 200
+_RISK_ASSESSMENT_ERROR = (b'{"error":"Error processing risk assessment","message":%s,"address":%s,'
+                          b'"riskScore":50,"riskClass":"Medium Risk","timestamp":%d}')
+_MODEL_PERFORMANCE_ERROR = b'{"error":"Error getting model performance","message":%s}'
+_FEATURE_IMPORTANCE_ERROR = b'{"error":"Error getting feature importance","message":%s}'
+_RECOMMENDATIONS_ERROR = b'{"error":"Error getting recommendations","message":%s,"address":%s}'
+_SIMULATE_RISK_ERROR = b'{"error":"Error simulating risk","message":%s}'
+_SCENARIO_ANALYSIS_ERROR = b'{"error":"Error performing scenario analysis","message":%s}'
+
+def _json_string(value):
+    """Encode a value as a JSON string literal, truncated to bound error bodies."""
+    return json.dumps(str(value)[:_MAX_ERROR_MESSAGE_LENGTH]).encode('utf-8')
+
+def _error_response(template, *values):
+    """Fill a pre-serialized error body and return it as a 500 response."""
+    return Response(template % values, status=500, mimetype='application/json')
+
+# Shared IOTA connection, set up once by initialize_iota_connection()
+iota_connection = None
+
 # Initialize IOTA connection
 def initialize_iota_connection():
     """Initialize IOTA network connection"""
+    global iota_connection
     try:
         logger.info("Initializing IOTA connection...")
         iota_connection = get_iota_connection()
-        if iota_connection and iota_connection.is_connected:
+        if iota_connection and iota_connection.ensure_connected():
             logger.info("Successfully connected to IOTA network")
             return iota_connection
         else:
             logger.warning("Failed to connect to IOTA network")
             return None
     except Exception as e:
-        logger.error(f"Error initializing IOTA connection: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error initializing IOTA connection: {e}")
         return None
 
 # Routes
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    global risk_model
-    
     # Check if risk model is initialized
     model_status = "initialized" if risk_model is not None else "not initialized"
     
-    # Check IOTA connection
-    iota_connection = None
+    # Check IOTA connection state without touching the network; node health is
+    # tracked by the connection itself as it serves requests
     iota_status = "disconnected"
-    try:
-        iota_connection = get_iota_connection()
-        if iota_connection and iota_connection.is_connected:
-            iota_status = "connected"
-            
-            # Get network information
-            network_info = iota_connection.get_network_info()
-            network_name = network_info.get("network", "unknown")
-        else:
-            network_name = "unknown"
-    except Exception as e:
-        logger.error(f"Error checking IOTA connection: {e}")
-        network_name = "error"
+    network_name = "unknown"
+    if iota_connection is not None and iota_connection.is_connected:
+        iota_status = "connected"
+        network_name = iota_connection.network
     
-    return jsonify({
+    return _json_response({
         "status": "ok",
         "riskModel": model_status,
         "iota": {
@@ -118,215 +486,98 @@ def assess_risk():
     
     Returns risk assessment results
     """
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
         # Get request data
-        data = request.json
+        data = request.get_json(silent=True)
         
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+        if not data or not isinstance(data, dict):
+            return _json_response({"error": "No data provided"}, 400)
         
         if "address" not in data:
-            return jsonify({"error": "No address provided"}), 400
+            return _json_response({"error": "No address provided"}, 400)
         
-        logger.info(f"Assessing risk for address: {data['address']}")
+        try:
+            user = RiskAssessmentRequest(**data)
+        except ValidationError as e:
+            return _validation_error_response(e)
         
-        # Add IOTA address if provided
-        iota_address = data.get("iota_address")
-        if iota_address:
-            logger.info(f"Using IOTA address: {iota_address}")
+        logger.info(f"Assessing risk for address: {user.address}")
         
-        # Process assessment using synchronous wrapper
-        assessment = assess_risk_sync(data)
+        # Add IOTA address if provided
+        if user.iota_address:
+            logger.info(f"Using IOTA address: {user.iota_address}")
+        
+        # Batch with concurrent requests on the shared model; fall back to the
+        # synchronous wrapper if the model failed to initialize
+        if risk_model is not None:
+            try:
+                assessment = _risk_batcher.submit(data).result(timeout=_risk_batcher.result_timeout)
+            except FutureTimeoutError:
+                # Don't tie up the worker thread behind a stuck or dead batcher
+                logger.error(f"Risk assessment for {user.address} timed out after {_risk_batcher.result_timeout}s")
+                return _error_response(
+                    _RISK_ASSESSMENT_ERROR, _json_string("Risk assessment timed out"),
+                    _json_string(user.address), int(time.time())
+                )
+        else:
+            assessment = assess_risk_sync(data)
         
-        logger.info(f"Risk assessment completed for {data['address']}: Score = {assessment['riskScore']}")
+        logger.info(f"Risk assessment completed for {user.address}: Score = {assessment['riskScore']}")
         
-        return jsonify(assessment)
+        return _json_response(assessment)
     
     except Exception as e:
-        logger.error(f"Error processing risk assessment: {e}")
-        logger.error(traceback.format_exc())
-        
-        return jsonify({
-            "error": "Error processing risk assessment",
-            "message": str(e),
-            "address": data.get("address", "unknown"),
-            "riskScore": 50,  # Default medium risk
-            "riskClass": "Medium Risk",
-            "timestamp": int(time.time())
-        }), 500
+        logger.exception(f"Error processing risk assessment: {e}")
+        
+        return _error_response(
+            _RISK_ASSESSMENT_ERROR, _json_string(e), _json_string(data.get("address", "unknown")), int(time.time())
+        )
 
 @app.route('/api/model/performance', methods=['GET'])
 def model_performance():
     """Get model performance metrics"""
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
-        # Get performance metrics
-        # In a real implementation, these would be calculated from historical data
-        # For now, we'll return simulated metrics
-        
-        performance = {
-            "accuracy": 0.87,
-            "precision": 0.85,
-            "recall": 0.90,
-            "f1Score": 0.87,
-            "totalSamples": 1000,
-            "correctPredictions": 870,
-            "truePositives": 450,
-            "falsePositives": 80,
-            "trueNegatives": 420,
-            "falseNegatives": 50,
-            "confusionMatrix": [
-                [450, 80],  # [TP, FP]
-                [50, 420]   # [FN, TN]
-            ],
-            "riskBucketAccuracy": {
-                "veryLow": 0.95,
-                "low": 0.90,
-                "medium": 0.85,
-                "high": 0.80,
-                "veryHigh": 0.75
-            },
-            "defaultRate": 0.05,
-            "riskBins": [
-                {"score": "0-20", "count": 150, "defaultRate": 0.01},
-                {"score": "21-40", "count": 250, "defaultRate": 0.02},
-                {"score": "41-60", "count": 300, "defaultRate": 0.05},
-                {"score": "61-80", "count": 200, "defaultRate": 0.08},
-                {"score": "81-100", "count": 100, "defaultRate": 0.15}
-            ],
-            "lastUpdate": int(time.time())
-        }
-        
-        return jsonify(performance)
+        # Simulated metrics, serialized once at import
+        return _static_json_response(_MODEL_PERFORMANCE_JSON)
     
     except Exception as e:
-        logger.error(f"Error getting model performance: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error getting model performance: {e}")
         
-        return jsonify({
-            "error": "Error getting model performance",
-            "message": str(e)
-        }), 500
+        return _error_response(_MODEL_PERFORMANCE_ERROR, _json_string(e))
 
 @app.route('/api/feature-importance', methods=['GET'])
 def feature_importance():
     """Get feature importance for the risk model"""
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
-        # Get feature importance
-        # In a real implementation, these would be calculated from the model
-        # For now, we'll return simulated feature importance
-        
-        features = [
-            {"feature": "transaction_count", "importance": 0.15, "description": "Number of transactions"},
-            {"feature": "balance", "importance": 0.12, "description": "Account balance"},
-            {"feature": "activity_regularity", "importance": 0.11, "description": "Regularity of user activity"},
-            {"feature": "cross_layer_transfers", "importance": 0.10, "description": "Cross-layer transaction activity"},
-            {"feature": "identity_verification", "importance": 0.09, "description": "Identity verification status"},
-            {"feature": "wallet_balance", "importance": 0.08, "description": "Wallet balance"},
-            {"feature": "collateral_ratio", "importance": 0.07, "description": "Ratio of collateral to borrows"},
-            {"feature": "native_tokens_count", "importance": 0.06, "description": "Number of different tokens held"},
-            {"feature": "first_activity_days", "importance": 0.05, "description": "Days since first activity"},
-            {"feature": "message_count", "importance": 0.04, "description": "Number of messages sent"}
-        ]
-        
-        return jsonify({
-            "features": features,
-            "modelVersion": "v2.0",
-            "lastUpdate": int(time.time())
-        })
+        # Simulated feature importance, serialized once at import
+        return _static_json_response(_FEATURE_IMPORTANCE_JSON)
     
     except Exception as e:
-        logger.error(f"Error getting feature importance: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error getting feature importance: {e}")
         
-        return jsonify({
-            "error": "Error getting feature importance",
-            "message": str(e)
-        }), 500
+        return _error_response(_FEATURE_IMPORTANCE_ERROR, _json_string(e))
 
 @app.route('/api/recommendations/<address>', methods=['GET'])
 def get_recommendations(address):
     """Get personalized recommendations for a user"""
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
         if not address:
-            return jsonify({"error": "No address provided"}), 400
+            return _json_response({"error": "No address provided"}, 400)
         
         logger.info(f"Getting recommendations for address: {address}")
         
-        # For now, we'll return simulated recommendations
-        # In a real implementation, these would be derived from the model
-        
-        recommendations = [
-            {
-                "title": "Increase Collateral Ratio",
-                "description": "Adding more collateral will reduce your risk score and improve borrowing terms.",
-                "impact": "high",
-                "actionType": "depositCollateral"
-            },
-            {
-                "title": "Complete Identity Verification",
-                "description": "Verify your identity using IOTA Identity to get better borrowing rates.",
-                "impact": "high",
-                "actionType": "verifyIdentity"
-            },
-            {
-                "title": "Increase IOTA Network Activity",
-                "description": "More transactions on the IOTA network will improve your on-chain reputation.",
-                "impact": "medium",
-                "actionType": "increaseActivity"
-            },
-            {
-                "title": "Try Cross-Layer Transfers",
-                "description": "Demonstrate blockchain expertise by using both L1 and L2 layers.",
-                "impact": "medium",
-                "actionType": "crossLayerTransfer"
-            },
-            {
-                "title": "Balance Asset Distribution",
-                "description": "Diversify your assets across multiple token types for better risk profile.",
-                "impact": "low",
-                "actionType": "diversifyAssets"
-            }
-        ]
-        
-        return jsonify({
-            "address": address,
-            "recommendations": recommendations,
-            "timestamp": int(time.time())
-        })
+        # Simulated recommendations, serialized once at import
+        return Response(
+            b'{"address":' + json.dumps(address).encode('utf-8') +
+            b',"recommendations":' + _RECOMMENDATIONS_JSON +
+            b',"timestamp":%d}' % int(time.time()),
+            mimetype='application/json'
+        )
     
     except Exception as e:
-        logger.error(f"Error getting recommendations for {address}: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error getting recommendations for {address}: {e}")
         
-        return jsonify({
-            "error": "Error getting recommendations",
-            "message": str(e),
-            "address": address
-        }), 500
+        return _error_response(_RECOMMENDATIONS_ERROR, _json_string(e), _json_string(address))
 
 @app.route('/api/ai/simulate-risk', methods=['POST'])
 def simulate_risk():
@@ -343,144 +594,30 @@ def simulate_risk():
     
     Returns simulated risk assessment
     """
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
         # Get request data
-        data = request.json
-        
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-        
-        logger.info(f"Simulating risk with parameters: {data}")
-        
-        # Required fields
-        collateral_amount = data.get('collateralAmount', 1000)
-        borrow_amount = data.get('borrowAmount', 500)
-        asset = data.get('asset', 'smr')
-        use_iota = data.get('useIOTA', False)
-        cross_chain_activity = data.get('crossChainActivity', False)
-        identity_verified = data.get('identityVerified', False)
-        
-        # Calculate collateral ratio
-        collateral_ratio = collateral_amount / borrow_amount if borrow_amount > 0 else float('inf')
-        
-        # Use risk model to simulate risk
-        if risk_model:
-            # Prepare simulation data
-            simulation_data = {
-                "collateralAmount": collateral_amount,
-                "borrowAmount": borrow_amount,
-                "asset": asset,
-                "useIOTA": use_iota,
-                "crossChainActivity": cross_chain_activity,
-                "identityVerified": identity_verified,
-                "collateralRatio": collateral_ratio
-            }
-            
-            # Call model for simulation
-            result = risk_model.simulate_risk(simulation_data)
-        else:
-            # Fallback simulation logic (similar to frontend implementation)
-            # Base risk factors
-            base_risk = 50  # Start at medium risk
-            
-            # Collateral ratio factor (-20 to +30 points)
-            collateral_ratio_impact = 0
-            if collateral_ratio >= 2.0:
-                collateral_ratio_impact = -20  # Very good ratio
-            elif collateral_ratio >= 1.5:
-                collateral_ratio_impact = -10  # Good ratio
-            elif collateral_ratio < 1.2:
-                collateral_ratio_impact = 20  # Dangerous ratio
-            elif collateral_ratio < 1.3:
-                collateral_ratio_impact = 10  # Risky ratio
-            
-            # Asset factor (-10 to +10 points)
-            asset_impact = 0
-            if asset in ['usdt', 'dai']:
-                asset_impact = -5  # Stablecoins are less risky
-            elif asset in ['eth', 'btc']:
-                asset_impact = 5  # Major cryptos have moderate risk
-            elif asset == 'smr':
-                asset_impact = -10  # IOTA's Shimmer has lower risk on this platform
-            
-            # IOTA usage factor (-15 to 0 points)
-            iota_impact = -15 if use_iota else 0
-            
-            # Cross-chain activity (-10 to 0 points)
-            cross_chain_impact = -10 if cross_chain_activity else 0
-            
-            # Identity verification (-15 to 0 points)
-            identity_impact = -15 if identity_verified else 0
-            
-            # Calculate total risk score
-            risk_score = base_risk + collateral_ratio_impact + asset_impact + iota_impact + cross_chain_impact + identity_impact
-            
-            # Ensure score is between 0 and 100
-            risk_score = max(0, min(100, risk_score))
-            
-            # Liquidation risk
-            liquidation_risk = max(0, min(100, 100 - (collateral_ratio * 50)))
-            
-            # Interest rate based on risk score
-            interest_rate = 3 + (risk_score / 10)
-            
-            # Max borrowing power
-            max_borrow_amount = collateral_amount * 0.8
-            
-            # Construct result
-            result = {
-                "riskScore": round(risk_score),
-                "collateralRatio": collateral_ratio,
-                "liquidationRisk": round(liquidation_risk),
-                "interestRate": round(interest_rate * 100) / 100,
-                "maxBorrowAmount": round(max_borrow_amount * 100) / 100,
-                "factors": [
-                    {
-                        "name": "Collateral Ratio",
-                        "impact": collateral_ratio_impact,
-                        "description": f"{collateral_ratio:.2f}x ratio {'decreases' if collateral_ratio_impact <= 0 else 'increases'} risk"
-                    },
-                    {
-                        "name": "Asset Selection",
-                        "impact": asset_impact,
-                        "description": f"{asset.upper()} {'decreases' if asset_impact <= 0 else 'increases'} risk"
-                    },
-                    {
-                        "name": "IOTA Integration",
-                        "impact": iota_impact,
-                        "description": "IOTA usage lowers risk" if use_iota else "No IOTA integration"
-                    },
-                    {
-                        "name": "Cross-Chain Activity",
-                        "impact": cross_chain_impact,
-                        "description": "Cross-chain activity lowers risk" if cross_chain_activity else "No cross-chain activity"
-                    },
-                    {
-                        "name": "Identity Verification",
-                        "impact": identity_impact,
-                        "description": "Verified identity lowers risk" if identity_verified else "No identity verification"
-                    }
-                ]
-            }
+        data = request.get_json(silent=True)
+        
+        if not data or not isinstance(data, dict):
+            return _json_response({"error": "No data provided"}, 400)
+        
+        try:
+            params = _model_dict(SimulationParams(**data))
+        except ValidationError as e:
+            return _validation_error_response(e)
+        
+        logger.info(f"Simulating risk with parameters: {params}")
+        
+        result = simulate_risk_internal(params)
         
         logger.info(f"Risk simulation completed: Score = {result['riskScore']}")
         
-        return jsonify(result)
+        return _json_response(result)
     
     except Exception as e:
-        logger.error(f"Error simulating risk: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error simulating risk: {e}")
         
-        return jsonify({
-            "error": "Error simulating risk",
-            "message": str(e)
-        }), 500
+        return _error_response(_SIMULATE_RISK_ERROR, _json_string(e))
 
 @app.route('/api/ai/scenario-analysis', methods=['POST'])
 def scenario_analysis():
@@ -498,48 +635,41 @@ def scenario_analysis():
     
     Returns analysis results for all scenarios
     """
-    global risk_model
-    
-    # Initialize model if not already done
-    if risk_model is None:
-        initialize_model()
-    
     try:
         # Get request data
-        data = request.json
+        data = request.get_json(silent=True)
         
-        if not data or 'scenarios' not in data:
-            return jsonify({"error": "No scenarios provided"}), 400
+        if not data or not isinstance(data, dict) or 'scenarios' not in data:
+            return _json_response({"error": "No scenarios provided"}, 400)
         
-        scenarios = data.get('scenarios', [])
+        try:
+            scenarios = ScenarioAnalysisRequest(**data).scenarios
+        except ValidationError as e:
+            return _validation_error_response(e)
         
         if not scenarios:
-            return jsonify({"error": "Empty scenarios array"}), 400
+            return _json_response({"error": "Empty scenarios array"}, 400)
         
         logger.info(f"Analyzing {len(scenarios)} scenarios")
         
         results = []
         
+        simulation_params_list = [_model_dict(scenario, exclude={'name'}) for scenario in scenarios]
+        
+        # The model simulates one scenario at a time; the fallback scores them all at once
+        if _model_can_simulate():
+            if len(simulation_params_list) >= _PARALLEL_SCENARIO_THRESHOLD:
+                simulation_results = list(_get_simulation_pool().map(simulate_risk_internal, simulation_params_list))
+            else:
+                simulation_results = [simulate_risk_internal(params) for params in simulation_params_list]
+        else:
+            simulation_results = _simulate_risk_batch(simulation_params_list)
+        
         # Process each scenario
-        for scenario in scenarios:
-            name = scenario.get('name', 'Unnamed Scenario')
-            
-            # Make a separate request to the simulate-risk endpoint for each scenario
-            simulation_params = {
-                "collateralAmount": scenario.get('collateralAmount', 1000),
-                "borrowAmount": scenario.get('borrowAmount', 500),
-                "asset": scenario.get('asset', 'smr'),
-                "useIOTA": scenario.get('useIOTA', False),
-                "crossChainActivity": scenario.get('crossChainActivity', False),
-                "identityVerified": scenario.get('identityVerified', False)
-            }
-            
-            # Simulate risk for this scenario
-            simulation_result = simulate_risk_internal(simulation_params)
-            
+        for scenario, simulation_params, simulation_result in zip(scenarios, simulation_params_list, simulation_results):
             # Add scenario name and original parameters
             result = {
-                "scenarioName": name,
+                "scenarioName": scenario.name,
                 "collateralAmount": simulation_params["collateralAmount"],
                 "borrowAmount": simulation_params["borrowAmount"],
                 "asset": simulation_params["asset"],
@@ -587,20 +717,27 @@ def scenario_analysis():
         
         logger.info(f"Scenario analysis completed for {len(results)} scenarios")
         
-        return jsonify(results)
+        return _json_response(results)
     
     except Exception as e:
-        logger.error(f"Error performing scenario analysis: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error performing scenario analysis: {e}")
         
-        return jsonify({
-            "error": "Error performing scenario analysis",
-            "message": str(e)
-        }), 500
+        return _error_response(_SCENARIO_ANALYSIS_ERROR, _json_string(e))
+
+def _model_can_simulate():
+    """Whether the loaded risk model provides its own simulate_risk."""
+    return risk_model is not None and hasattr(risk_model, 'simulate_risk')
+
+def _fallback_simulate(collateral_amount, borrow_amount, asset, use_iota, cross_chain_activity, identity_verified):
+    """Simulate risk with the fallback rules (similar to frontend implementation)."""
+    collateral_ratio = collateral_amount / borrow_amount if borrow_amount > 0 else float('inf')
+    scores = _risk_kernel(
+        collateral_amount, collateral_ratio, asset, use_iota, cross_chain_activity, identity_verified
+    )
+    return _simulation_result(collateral_ratio, asset, use_iota, cross_chain_activity, identity_verified, scores)
 
 def simulate_risk_internal(params):
     """Internal function to simulate risk without HTTP request"""
-    # Calculate collateral ratio
     collateral_amount = params.get('collateralAmount', 1000)
     borrow_amount = params.get('borrowAmount', 500)
     asset = params.get('asset', 'smr')
@@ -608,96 +745,19 @@ def simulate_risk_internal(params):
     cross_chain_activity = params.get('crossChainActivity', False)
     identity_verified = params.get('identityVerified', False)
     
-    collateral_ratio = collateral_amount / borrow_amount if borrow_amount > 0 else float('inf')
-    
     # Use risk model to simulate risk
-    if risk_model:
-        # Call model for simulation
-        return risk_model.simulate_risk(params)
-    else:
-        # Fallback simulation logic (similar to frontend implementation)
-        # Base risk factors
-        base_risk = 50  # Start at medium risk
-        
-        # Collateral ratio factor (-20 to +30 points)
-        collateral_ratio_impact = 0
-        if collateral_ratio >= 2.0:
-            collateral_ratio_impact = -20  # Very good ratio
-        elif collateral_ratio >= 1.5:
-            collateral_ratio_impact = -10  # Good ratio
-        elif collateral_ratio < 1.2:
-            collateral_ratio_impact = 20  # Dangerous ratio
-        elif collateral_ratio < 1.3:
-            collateral_ratio_impact = 10  # Risky ratio
-        
-        # Asset factor (-10 to +10 points)
-        asset_impact = 0
-        if asset in ['usdt', 'dai']:
-            asset_impact = -5  # Stablecoins are less risky
-        elif asset in ['eth', 'btc']:
-            asset_impact = 5  # Major cryptos have moderate risk
-        elif asset == 'smr':
-            asset_impact = -10  # IOTA's Shimmer has lower risk on this platform
-        
-        # IOTA usage factor (-15 to 0 points)
-        iota_impact = -15 if use_iota else 0
-        
-        # Cross-chain activity (-10 to 0 points)
-        cross_chain_impact = -10 if cross_chain_activity else 0
-        
-        # Identity verification (-15 to 0 points)
-        identity_impact = -15 if identity_verified else 0
-        
-        # Calculate total risk score
-        risk_score = base_risk + collateral_ratio_impact + asset_impact + iota_impact + cross_chain_impact + identity_impact
-        
-        # Ensure score is between 0 and 100
-        risk_score = max(0, min(100, risk_score))
-        
-        # Liquidation risk
-        liquidation_risk = max(0, min(100, 100 - (collateral_ratio * 50)))
-        
-        # Interest rate based on risk score
-        interest_rate = 3 + (risk_score / 10)
-        
-        # Max borrowing power
-        max_borrow_amount = collateral_amount * 0.8
-        
-        # Construct result
-        return {
-            "riskScore": round(risk_score),
-            "collateralRatio": collateral_ratio,
-            "liquidationRisk": round(liquidation_risk),
-            "interestRate": round(interest_rate * 100) / 100,
-            "maxBorrowAmount": round(max_borrow_amount * 100) / 100,
-            "factors": [
-                {
-                    "name": "Collateral Ratio",
-                    "impact": collateral_ratio_impact,
-                    "description": f"{collateral_ratio:.2f}x ratio {'decreases' if collateral_ratio_impact <= 0 else 'increases'} risk"
-                },
-                {
-                    "name": "Asset Selection",
-                    "impact": asset_impact,
-                    "description": f"{asset.upper()} {'decreases' if asset_impact <= 0 else 'increases'} risk"
-                },
-                {
-                    "name": "IOTA Integration",
-                    "impact": iota_impact,
-                    "description": "IOTA usage lowers risk" if use_iota else "No IOTA integration"
-                },
-                {
-                    "name": "Cross-Chain Activity",
-                    "impact": cross_chain_impact,
-                    "description": "Cross-chain activity lowers risk" if cross_chain_activity else "No cross-chain activity"
-                },
-                {
-                    "name": "Identity Verification",
-                    "impact": identity_impact,
-                    "description": "Verified identity lowers risk" if identity_verified else "No identity verification"
-                }
-            ]
-        }
+    if _model_can_simulate():
+        return risk_model.simulate_risk({
+            "collateralAmount": collateral_amount,
+            "borrowAmount": borrow_amount,
+            "asset": asset,
+            "useIOTA": use_iota,
+            "crossChainActivity": cross_chain_activity,
+            "identityVerified": identity_verified,
+            "collateralRatio": collateral_amount / borrow_amount if borrow_amount > 0 else float('inf')
+        })
+    
+    return _fallback_simulate(collateral_amount, borrow_amount, asset, use_iota, cross_chain_activity, identity_verified)
 
 if __name__ == '__main__':
     # Initialize model
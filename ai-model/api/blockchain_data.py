@@ -8,14 +8,44 @@ and L2 (EVM) to provide a comprehensive view of user activity across both layers
 
 import aiohttp
 import asyncio
+import functools
 import pandas as pd
 import numpy as np
 import logging
 import json
+import time
 from datetime import datetime, timedelta
-from web3 import Web3
+from web3 import AsyncWeb3, AsyncHTTPProvider
 import os
 import sys
+from pathlib import Path
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+from cachetools import TTLCache
+
+# orjson parses Tangle payloads and ABI files straight from bytes, several
+# times faster than the stdlib decoder
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# pyarrow backs the on-disk cache of finalized transaction history; without
+# it every scan starts from the RPC node
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# uvloop's libuv-based loop schedules the collector's many short RPC tasks
+# and socket reads with less overhead than the default selector loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Add IOTA SDK to path
 sys.path.append('../../iota-sdk')
@@ -31,24 +61,287 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+_LENDING_POOL_ABI_PATH = '../../abis/LendingPool.json'
+_BRIDGE_ABI_PATH = '../../abis/CrossLayerBridge.json'
+
+class _CollectorEnv(NamedTuple):
+    """Collector settings taken from the environment."""
+    evm_rpc_url: str
+    iota_node_url: str
+    iota_network: str
+    lending_pool_address: str
+    bridge_address: str
+    streams_seed: Optional[str]
+    use_multicall3: bool
+    multicall3_address: Optional[str]
+    rpc_concurrency: int
+    tx_cache_dir: Optional[str]
+    tx_cache_max_bytes: int
+
+def _read_env():
+    """Snapshot the collector's environment variables."""
+    return _CollectorEnv(
+        evm_rpc_url=os.environ.get('IOTA_EVM_RPC_URL', 'https://evm.wasp.sc.iota.org'),
+        iota_node_url=os.environ.get('IOTA_NODE_URL', 'https://api.testnet.shimmer.network'),
+        iota_network=os.environ.get('IOTA_NETWORK', 'testnet'),
+        lending_pool_address=os.environ.get('LENDING_POOL_ADDRESS', _ZERO_ADDRESS),
+        bridge_address=os.environ.get('BRIDGE_ADDRESS', _ZERO_ADDRESS),
+        streams_seed=os.environ.get('STREAMS_SEED'),
+        use_multicall3=os.environ.get('USE_MULTICALL3', 'false').lower() == 'true',
+        multicall3_address=os.environ.get('MULTICALL3_ADDRESS'),
+        rpc_concurrency=int(os.environ.get('RPC_CONCURRENCY', '16')),
+        tx_cache_dir=os.environ.get('BC_CACHE_DIR', '~/.iota_cache') or None,
+        tx_cache_max_bytes=int(os.environ.get('BC_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+    )
+
+# Read once at import; collectors may be built per request
+_ENV = _read_env()
+
+@functools.lru_cache(maxsize=4096)
+def _checksum_address(address):
+    """EIP-55 checksum an address, remembering results since each one costs a keccak256."""
+    return AsyncWeb3.to_checksum_address(address)
+
+@functools.lru_cache(maxsize=8)
+def _load_abi(path):
+    """Read and parse a contract ABI file once per path (shared; do not mutate)."""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+def _new_event_loop():
+    """Create an event loop for the synchronous wrappers, preferring uvloop."""
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+def _timestamp_stats(timestamps, now_timestamp):
+    """Sort activity timestamps once and return (sorted array, days since first, days since last)."""
+    sorted_timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
+    days_since_first = (now_timestamp - sorted_timestamps[0]) / 86400
+    days_since_last = (now_timestamp - sorted_timestamps[-1]) / 86400
+    return sorted_timestamps, days_since_first, days_since_last
+
+def _timestamp_order(transactions):
+    """Stable ascending timestamp order of transactions (missing timestamps count as 0) and the sorted timestamps."""
+    timestamps = np.fromiter(
+        (tx.get('timestamp', 0) for tx in transactions), dtype=np.float64, count=len(transactions)
+    )
+    order = np.argsort(timestamps, kind='stable')
+    return order, timestamps[order]
+
+def _decode_tagged_data(message):
+    """Decode the hex-encoded JSON payload of a Tangle tagged-data message."""
+    data = message.data
+    if data.startswith('0x'):
+        data = data[2:]
+    return _json_loads(bytes.fromhex(data))
+
+# Tangle tags whose messages may reference a user's EVM address
+_USER_TANGLE_TAGS = (
+    'RISK_SCORE_UPDATE',
+    'VERIFICATION_STATUS',
+    'LOAN_STATUS',
+    'REPAYMENT',
+    'COLLATERAL_UPDATE',
+    'CROSS_LAYER_DEPOSIT',
+    'CROSS_LAYER_WITHDRAWAL'
+)
+
+# Every tag read while extracting one user's features, fetched once up front;
+# ADDRESS_MAPPING is served from the collector's address index instead
+_FEATURE_TAGS = (*_USER_TANGLE_TAGS, 'CREDENTIAL')
+
+# (maxsize, ttl seconds) of the per-collector RPC response caches; the address
+# mapping index is global to the Tangle and changes rarely, DeFi positions
+# move fastest
+_RESPONSE_CACHE_SETTINGS = {
+    'transactions': (4096, 60),
+    'tagged_messages': (256, 60),
+    'address_mapping': (1, 300),
+    'defi_features': (4096, 30),
+    'block_number': (1, 5)
+}
+
+# eth_getLogs history scan: total lookback, blocks per request (public nodes
+# cap or time out on wide ranges) and how many windows are fetched at once
+_LOG_LOOKBACK_BLOCKS = 200_000
+_LOG_WINDOW_BLOCKS = 2048
+_LOG_WINDOWS_IN_FLIGHT = 8
+
+# Transactions at least this many blocks deep are treated as final and kept in
+# the on-disk history cache; wei values are stored as strings since they can
+# exceed int64
+_FINALITY_DEPTH = 64
+_TX_CACHE_SCHEMA = pa.schema([
+    ('hash', pa.string()),
+    ('from', pa.string()),
+    ('to', pa.string()),
+    ('value', pa.string()),
+    ('block_number', pa.int64()),
+    ('timestamp', pa.int64()),
+    ('gas_used', pa.int64()),
+    ('status', pa.int64())
+]) if pa is not None else None
+
+# Backoff between attempts of an RPC call that hit a transient transport
+# error (connection reset, timeout, HTTP 429/5xx); one retry per delay
+_RPC_RETRY_DELAYS = (0.2, 0.5, 1.0)
+_RPC_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Lending pool Borrow/Repay/Liquidation history is read over this many
+# recent blocks instead of from genesis
+_DEFI_EVENT_LOOKBACK_BLOCKS = 500_000
+
+# Bridge deposit/withdrawal history is read over the same kind of bounded
+# window rather than through filters installed from genesis
+_BRIDGE_EVENT_LOOKBACK_BLOCKS = 500_000
+
+# Per-user lending pool view functions, each taking the user address
+_LENDING_POOL_READS = ('borrows', 'deposits', 'collaterals', 'riskScores', 'getUserCollateralAssets')
+
+# Multicall3 is deployed at the same address on most EVM chains; only the
+# aggregate3 entry point is needed to fold the lending pool reads into one call
+_MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_MULTICALL3_ABI = [{
+    'name': 'aggregate3',
+    'type': 'function',
+    'stateMutability': 'payable',
+    'inputs': [{
+        'name': 'calls',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'target', 'type': 'address'},
+            {'name': 'allowFailure', 'type': 'bool'},
+            {'name': 'callData', 'type': 'bytes'}
+        ]
+    }],
+    'outputs': [{
+        'name': 'returnData',
+        'type': 'tuple[]',
+        'components': [
+            {'name': 'success', 'type': 'bool'},
+            {'name': 'returnData', 'type': 'bytes'}
+        ]
+    }]
+}]
+
+_CACHE_MISS = object()
+
+# Per-layer features used when a layer cannot be read; read-only since they
+# are shared, so error paths hand out dict() copies
+_DEFAULT_EVM_FEATURES = MappingProxyType({
+    'transaction_count': 0,
+    'avg_transaction_value': 0,
+    'wallet_age_days': 0,
+    'previous_loans_count': 0,
+    'repayment_ratio': 0.5,
+    'default_count': 0,
+    'collateral_diversity': 0,
+    'lending_protocol_interactions': 0,
+    'wallet_balance_volatility': 0,
+    'wallet_balance': 0
+})
+
+_DEFAULT_IOTA_FEATURES = MappingProxyType({
+    'iota_transaction_count': 0,
+    'iota_message_count': 0,
+    'iota_balance': 0,
+    'iota_activity_regularity': 0,
+    'iota_first_activity_days': 0,
+    'iota_native_tokens_count': 0
+})
+
+_DEFAULT_CROSS_LAYER_FEATURES = MappingProxyType({
+    'cross_chain_activity': 0,
+    'cross_layer_transfers': 0,
+    'days_since_first_cross_layer': 0,
+    'days_since_last_cross_layer': 0,
+    'cross_layer_active': False
+})
+
+_DEFAULT_IDENTITY_FEATURES = MappingProxyType({
+    'identity_verification_level': 'none',
+    'identity_verified': False,
+    'verification_count': 0,
+    'credential_count': 0
+})
+
+_DEFAULT_DEFI_FEATURES = MappingProxyType({
+    'loans_count': 0,
+    'repayment_ratio': 0.5,
+    'default_count': 0,
+    'collateral_diversity': 0,
+    'protocol_interactions': 0,
+    'current_borrows': 0,
+    'current_deposits': 0,
+    'current_collaterals': 0,
+    'current_risk_score': 50
+})
+
+# Features returned when extraction fails before any layer is read
+_DEFAULT_USER_FEATURES = MappingProxyType({
+    'transaction_count': 0,
+    'avg_transaction_value': 0,
+    'wallet_age_days': 0,
+    'previous_loans_count': 0,
+    'repayment_ratio': 0.5,
+    'default_count': 0,
+    'collateral_diversity': 0,
+    'cross_chain_activity': 0,
+    'lending_protocol_interactions': 0,
+    'wallet_balance_volatility': 0,
+    'iota_transaction_count': 0,
+    'iota_message_count': 0,
+    'iota_balance': 0,
+    'iota_activity_regularity': 0,
+    'cross_layer_transfers': 0,
+    'identity_verification_level': 'none',
+    'has_iota_address': False
+})
+
 class BlockchainDataCollector:
     """
     Collects on-chain data from both IOTA Tangle and EVM layer for risk assessment.
+    
+    The collector is I/O bound and meant to run on uvloop where available:
+    the synchronous wrappers and __main__ here use it, and uvicorn picks it up
+    automatically when it is installed.
     """
     
     def __init__(self, rpc_url=None, iota_node_url=None):
         """Initialize the data collector with RPC URLs for both EVM and IOTA."""
         # EVM Layer configuration
-        self.rpc_url = rpc_url or os.environ.get('IOTA_EVM_RPC_URL', 'https://evm.wasp.sc.iota.org')
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        self.lending_pool_address = os.environ.get('LENDING_POOL_ADDRESS', '0x0000000000000000000000000000000000000000')
+        self.rpc_url = rpc_url or _ENV.evm_rpc_url
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(self.rpc_url))
+        # Keep-alive session shared by every JSON-RPC call, opened on first use
+        # because aiohttp binds it to the running event loop
+        self._session = None
+        # Caps RPC calls in flight; created on first use like the session
+        self._rpc_semaphore = None
+        
+        # Finalized transaction history persisted across runs, one file per address
+        self._tx_cache_dir = None
+        if pq is not None and _ENV.tx_cache_dir:
+            self._tx_cache_dir = Path(_ENV.tx_cache_dir).expanduser()
+        
+        # Short-lived caches of RPC responses re-read across consecutive requests
+        self._response_caches = {
+            name: TTLCache(maxsize=maxsize, ttl=ttl)
+            for name, (maxsize, ttl) in _RESPONSE_CACHE_SETTINGS.items()
+        }
+        self._cache_hits = dict.fromkeys(self._response_caches, 0)
+        self._cache_misses = dict.fromkeys(self._response_caches, 0)
+        # Tag fetches still in flight, so concurrent misses share one request
+        self._tag_fetches = {}
+        
+        self.lending_pool_address = _ENV.lending_pool_address
+        self.lending_pool = None
         
         # Load contract ABIs
         try:
-            with open('../../abis/LendingPool.json', 'r') as f:
-                self.lending_pool_abi = json.load(f)
+            self.lending_pool_abi = _load_abi(_LENDING_POOL_ABI_PATH)
                 
-            if self.lending_pool_address != '0x0000000000000000000000000000000000000000':
+            if self.lending_pool_address != _ZERO_ADDRESS:
                 self.lending_pool = self.w3.eth.contract(
                     address=self.lending_pool_address,
                     abi=self.lending_pool_abi
@@ -58,8 +351,16 @@ class BlockchainDataCollector:
             self.lending_pool_abi = []
             self.lending_pool = None
         
+        # Multicall3 is opt-in since not every chain has it deployed
+        self.multicall = None
+        if _ENV.use_multicall3:
+            self.multicall = self.w3.eth.contract(
+                address=_ENV.multicall3_address or _MULTICALL3_ADDRESS,
+                abi=_MULTICALL3_ABI
+            )
+        
         # IOTA Layer configuration
-        self.iota_node_url = iota_node_url or os.environ.get('IOTA_NODE_URL', 'https://api.testnet.shimmer.network')
+        self.iota_node_url = iota_node_url or _ENV.iota_node_url
         self.iota_client = None
         self.iota_identity = None
         self.iota_streams = None
@@ -70,11 +371,88 @@ class BlockchainDataCollector:
         logger.info(f"Initialized blockchain data collector with EVM RPC: {self.rpc_url}")
         logger.info(f"IOTA Node: {self.iota_node_url}")
     
+    async def _ensure_session(self):
+        """Open the pooled aiohttp session and hand it to the web3 provider."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=32,
+                keepalive_timeout=75,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            await self.w3.provider.cache_async_session(self._session)
+        return self._session
+    
+    async def _rpc(self, call, *args, **kwargs):
+        """
+        Await an RPC call under the concurrency limit, retrying transport errors.
+        
+        Args:
+            call: Callable returning a fresh awaitable per attempt
+            *args, **kwargs: Passed to `call`
+            
+        Returns:
+            The call's result; the last error is raised once retries run out
+        """
+        if self._rpc_semaphore is None:
+            self._rpc_semaphore = asyncio.Semaphore(_ENV.rpc_concurrency)
+        
+        for delay in (*_RPC_RETRY_DELAYS, None):
+            try:
+                async with self._rpc_semaphore:
+                    return await call(*args, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Other HTTP errors (400/401/403/404, e.g. a rejected log range)
+                # won't change on retry
+                if delay is None or (
+                    isinstance(e, aiohttp.ClientResponseError) and e.status not in _RPC_RETRY_STATUSES
+                ):
+                    raise
+                logger.warning(f"RPC call failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+    
+    def _cache_get(self, name, key):
+        """Look up a cached RPC response, returning _CACHE_MISS when absent or expired."""
+        value = self._response_caches[name].get(key, _CACHE_MISS)
+        if value is _CACHE_MISS:
+            self._cache_misses[name] += 1
+        else:
+            self._cache_hits[name] += 1
+        return value
+    
+    def cache_stats(self):
+        """Return hit/miss counts and current size of each RPC response cache."""
+        return {
+            name: {
+                'hits': self._cache_hits[name],
+                'misses': self._cache_misses[name],
+                'size': len(cache)
+            }
+            for name, cache in self._response_caches.items()
+        }
+    
+    async def aclose(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self):
+        await self._ensure_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     async def _init_iota_client(self):
         """Initialize IOTA client for Tangle interaction."""
         try:
             # Initialize IOTA client
-            network = os.environ.get('IOTA_NETWORK', 'testnet')
+            network = _ENV.iota_network
             logger.info(f"Connecting to IOTA {network}...")
             
             result = await createClient(network)
@@ -100,7 +478,7 @@ class BlockchainDataCollector:
             # Initialize IOTA Streams service
             try:
                 self.iota_streams = await createStreamsService(self.iota_client, {
-                    'seed': os.environ.get('STREAMS_SEED')
+                    'seed': _ENV.streams_seed
                 })
                 logger.info("IOTA Streams service initialized")
             except Exception as e:
@@ -123,24 +501,42 @@ class BlockchainDataCollector:
         """
         try:
             # Validate EVM address
-            evm_address = self.w3.to_checksum_address(address)
+            evm_address = _checksum_address(address)
+            await self._ensure_session()
+            
+            # Fetch every tag the layers below read in one concurrent pass
+            tagged_messages = await self._get_tagged_messages_by_tag(_FEATURE_TAGS)
             
             # Find matching IOTA address
             iota_address = await self._find_iota_address(evm_address)
             
             logger.info(f"Processing user {evm_address} with IOTA address {iota_address or 'unknown'}")
             
-            # Gather data from both layers in parallel
-            evm_future = asyncio.create_task(self._get_evm_features(evm_address))
-            iota_future = asyncio.create_task(self._get_iota_features(evm_address, iota_address))
-            cross_layer_future = asyncio.create_task(self._get_cross_layer_features(evm_address, iota_address))
-            identity_future = asyncio.create_task(self._get_identity_features(evm_address, iota_address))
-            
-            # Await all futures
-            evm_features = await evm_future
-            iota_features = await iota_future
-            cross_layer_features = await cross_layer_future
-            identity_features = await identity_future
+            # Share one reference time across the per-layer activity metrics
+            now_timestamp = int(time.time())
+            
+            # Gather data from both layers in parallel; a failing layer falls
+            # back to its defaults instead of discarding the others
+            results = await asyncio.gather(
+                self._get_evm_features(evm_address, now_timestamp),
+                self._get_iota_features(evm_address, iota_address, now_timestamp, tagged_messages),
+                self._get_cross_layer_features(evm_address, iota_address, now_timestamp, tagged_messages),
+                self._get_identity_features(evm_address, iota_address, tagged_messages),
+                return_exceptions=True
+            )
+            defaults = (
+                _DEFAULT_EVM_FEATURES,
+                _DEFAULT_IOTA_FEATURES,
+                _DEFAULT_CROSS_LAYER_FEATURES,
+                _DEFAULT_IDENTITY_FEATURES
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error extracting layer features for {address}: {result}")
+            evm_features, iota_features, cross_layer_features, identity_features = [
+                dict(default) if isinstance(result, Exception) else result
+                for result, default in zip(results, defaults)
+            ]
             
             # Combine features from both layers
             features = {
@@ -157,32 +553,14 @@ class BlockchainDataCollector:
         except Exception as e:
             logger.error(f"Error extracting features for {address}: {e}")
             # Return default features
-            return {
-                'transaction_count': 0,
-                'avg_transaction_value': 0,
-                'wallet_age_days': 0,
-                'previous_loans_count': 0,
-                'repayment_ratio': 0.5,
-                'default_count': 0,
-                'collateral_diversity': 0,
-                'cross_chain_activity': 0,
-                'lending_protocol_interactions': 0,
-                'wallet_balance_volatility': 0,
-                'iota_transaction_count': 0,
-                'iota_message_count': 0,
-                'iota_balance': 0,
-                'iota_activity_regularity': 0,
-                'cross_layer_transfers': 0,
-                'identity_verification_level': 'none',
-                'has_iota_address': False
-            }
+            return dict(_DEFAULT_USER_FEATURES)
             
-    async def _get_evm_features(self, address):
+    async def _get_evm_features(self, address, now_timestamp=None):
         """Get features from the EVM layer."""
         try:
             # Get basic account info
-            balance = self.w3.eth.get_balance(address)
-            nonce = self.w3.eth.get_transaction_count(address)
+            balance = await self._rpc(self.w3.eth.get_balance, address)
+            nonce = await self._rpc(self.w3.eth.get_transaction_count, address)
             
             # Get real transaction history from the node
             transactions = await self._get_real_transactions(address, limit=100)
@@ -190,14 +568,17 @@ class BlockchainDataCollector:
             
             # Calculate features from transactions
             avg_tx_value = np.mean([tx.get('value', 0) for tx in transactions]) if tx_count > 0 else 0
-            tx_frequency = await self._calculate_tx_frequency(transactions)
-            balance_volatility = await self._calculate_balance_volatility(address, transactions)
+            
+            # Order transactions by time once for the helpers below
+            order, sorted_timestamps = _timestamp_order(transactions)
+            tx_frequency = await self._calculate_tx_frequency(transactions, sorted_timestamps)
+            balance_volatility = await self._calculate_balance_volatility(address, transactions, order)
             
             # Get DeFi-specific features from lending pool contract
             defi_features = await self._get_defi_features(address)
             
             # Calculate wallet age from first transaction
-            wallet_age_days = await self._calculate_wallet_age(transactions)
+            wallet_age_days = await self._calculate_wallet_age(transactions, now_timestamp)
             
             return {
                 'transaction_count': tx_count,
@@ -213,45 +594,31 @@ class BlockchainDataCollector:
             }
         except Exception as e:
             logger.error(f"Error getting EVM features: {e}")
-            return {
-                'transaction_count': 0,
-                'avg_transaction_value': 0,
-                'wallet_age_days': 0,
-                'previous_loans_count': 0,
-                'repayment_ratio': 0.5,
-                'default_count': 0,
-                'collateral_diversity': 0,
-                'lending_protocol_interactions': 0,
-                'wallet_balance_volatility': 0,
-                'wallet_balance': 0
-            }
+            return dict(_DEFAULT_EVM_FEATURES)
             
-    async def _get_iota_features(self, evm_address, iota_address):
+    async def _get_iota_features(self, evm_address, iota_address, now_timestamp=None, tagged_messages=None):
         """Get features from the IOTA Tangle L1 layer."""
         try:
             if not self.iota_client or not iota_address:
                 # Return empty features if no IOTA client or address
-                return {
-                    'iota_transaction_count': 0,
-                    'iota_message_count': 0,
-                    'iota_balance': 0,
-                    'iota_activity_regularity': 0,
-                    'iota_first_activity_days': 0,
-                    'iota_native_tokens_count': 0
-                }
+                return dict(_DEFAULT_IOTA_FEATURES)
                 
-            # Get IOTA transactions for this address
-            iota_txs = await getAddressTransactions(
-                self.iota_client, 
-                iota_address
+            # Fetch transactions, user-related Tangle messages (which might be
+            # indexed by the EVM address) and balance in one round; a failed
+            # read only empties its own features
+            results = await asyncio.gather(
+                getAddressTransactions(self.iota_client, iota_address),
+                self._get_user_tangle_data(evm_address, tagged_messages),
+                getBalance(self.iota_client, iota_address, self.iota_node_manager),
+                return_exceptions=True
             )
-            
-            # Get all messages in the Tangle related to this user
-            # This includes Tangle data which might be indexed by the EVM address
-            tagged_messages = await self._get_user_tangle_data(evm_address)
-            
-            # Get balance if IOTA address is available
-            balance_data = await getBalance(self.iota_client, iota_address, self.iota_node_manager)
+            iota_txs, tagged_messages, balance_data = [
+                default if isinstance(result, Exception) else result
+                for result, default in zip(results, ([], [], {}))
+            ]
+            for result, source in zip(results, ('transactions', 'tagged messages', 'balance')):
+                if isinstance(result, Exception):
+                    logger.error(f"Error getting IOTA {source} for {iota_address}: {result}")
             
             # Extract features from IOTA data
             tx_count = len(iota_txs)
@@ -264,26 +631,22 @@ class BlockchainDataCollector:
             first_activity_days = 0
             
             if tx_count > 0:
-                # Sort transactions by timestamp
-                sorted_txs = sorted(iota_txs, key=lambda x: x.get('timestamp', 0))
+                # Sort timestamps once; days since first activity comes with them
+                if now_timestamp is None:
+                    now_timestamp = int(time.time())
+                sorted_timestamps, first_activity_days, _ = _timestamp_stats(
+                    [tx.get('timestamp', 0) for tx in iota_txs], now_timestamp
+                )
                 
                 # Calculate time between transactions
-                time_diffs = []
-                for i in range(1, len(sorted_txs)):
-                    diff = sorted_txs[i].get('timestamp', 0) - sorted_txs[i-1].get('timestamp', 0)
-                    time_diffs.append(diff)
+                time_diffs = np.diff(sorted_timestamps)
                     
                 # Calculate coefficient of variation (lower is more regular)
-                if len(time_diffs) > 0:
-                    mean_diff = np.mean(time_diffs)
-                    std_diff = np.std(time_diffs)
+                if time_diffs.size > 0:
+                    mean_diff = time_diffs.mean()
+                    std_diff = time_diffs.std()
                     if mean_diff > 0:
                         activity_regularity = 1 - min(1, std_diff / mean_diff)  # 0 to 1, higher is more regular
-                
-                # Calculate days since first activity
-                first_timestamp = sorted_txs[0].get('timestamp', 0)
-                now_timestamp = int(datetime.now().timestamp())
-                first_activity_days = (now_timestamp - first_timestamp) / 86400  # Convert to days
             
             return {
                 'iota_transaction_count': tx_count,
@@ -295,23 +658,16 @@ class BlockchainDataCollector:
             }
         except Exception as e:
             logger.error(f"Error getting IOTA features: {e}")
-            return {
-                'iota_transaction_count': 0,
-                'iota_message_count': 0,
-                'iota_balance': 0,
-                'iota_activity_regularity': 0,
-                'iota_first_activity_days': 0,
-                'iota_native_tokens_count': 0
-            }
+            return dict(_DEFAULT_IOTA_FEATURES)
             
-    async def _get_cross_layer_features(self, evm_address, iota_address):
+    async def _get_cross_layer_features(self, evm_address, iota_address, now_timestamp=None, tagged_messages=None):
         """Get features related to cross-layer activity between IOTA L1 and L2."""
         try:
             # Search for bridge transactions on L2
             bridge_txs = await self._get_bridge_transactions(evm_address)
             
             # Search for cross-layer messages in Tangle
-            cross_layer_messages = await self._get_cross_layer_messages(evm_address)
+            cross_layer_messages = await self._get_cross_layer_messages(evm_address, tagged_messages)
             
             # Count cross-layer transfers
             cross_layer_count = len(bridge_txs) + len(cross_layer_messages)
@@ -322,16 +678,15 @@ class BlockchainDataCollector:
                 all_timestamps = [tx.get('timestamp', 0) for tx in bridge_txs]
                 all_timestamps.extend([msg.get('timestamp', 0) for msg in cross_layer_messages])
                 
-                # Sort timestamps
-                sorted_timestamps = sorted(all_timestamps)
-                
                 # Calculate time since first and last cross-layer activity
-                first_timestamp = sorted_timestamps[0] if sorted_timestamps else 0
-                last_timestamp = sorted_timestamps[-1] if sorted_timestamps else 0
-                now_timestamp = int(datetime.now().timestamp())
+                if now_timestamp is None:
+                    now_timestamp = int(time.time())
+                sorted_timestamps, days_since_first, days_since_last = _timestamp_stats(all_timestamps, now_timestamp)
                 
-                days_since_first = (now_timestamp - first_timestamp) / 86400 if first_timestamp > 0 else 0
-                days_since_last = (now_timestamp - last_timestamp) / 86400 if last_timestamp > 0 else 0
+                if sorted_timestamps[0] <= 0:
+                    days_since_first = 0
+                if sorted_timestamps[-1] <= 0:
+                    days_since_last = 0
                 
                 return {
                     'cross_chain_activity': cross_layer_count,
@@ -341,36 +696,19 @@ class BlockchainDataCollector:
                     'cross_layer_active': days_since_last < 30  # Active in last 30 days
                 }
             else:
-                return {
-                    'cross_chain_activity': 0,
-                    'cross_layer_transfers': 0, 
-                    'days_since_first_cross_layer': 0,
-                    'days_since_last_cross_layer': 0,
-                    'cross_layer_active': False
-                }
+                return dict(_DEFAULT_CROSS_LAYER_FEATURES)
         except Exception as e:
             logger.error(f"Error getting cross-layer features: {e}")
-            return {
-                'cross_chain_activity': 0,
-                'cross_layer_transfers': 0,
-                'days_since_first_cross_layer': 0,
-                'days_since_last_cross_layer': 0,
-                'cross_layer_active': False
-            }
+            return dict(_DEFAULT_CROSS_LAYER_FEATURES)
             
-    async def _get_identity_features(self, evm_address, iota_address):
+    async def _get_identity_features(self, evm_address, iota_address, tagged_messages=None):
         """Get identity-related features from IOTA Identity."""
         try:
             if not self.iota_identity:
-                return {
-                    'identity_verification_level': 'none',
-                    'identity_verified': False,
-                    'verification_count': 0,
-                    'credential_count': 0
-                }
+                return dict(_DEFAULT_IDENTITY_FEATURES)
                 
             # Check if identity is verified
-            verification_messages = await self._get_verification_messages(evm_address)
+            verification_messages = await self._get_verification_messages(evm_address, tagged_messages)
             
             # Count verifications
             verification_count = len(verification_messages)
@@ -386,7 +724,7 @@ class BlockchainDataCollector:
                 is_verified = latest_verification.get('verified', False)
                 
             # Count credentials
-            credential_messages = await self._get_credential_messages(evm_address)
+            credential_messages = await self._get_credential_messages(evm_address, tagged_messages)
             credential_count = len(credential_messages)
             
             return {
@@ -397,35 +735,50 @@ class BlockchainDataCollector:
             }
         except Exception as e:
             logger.error(f"Error getting identity features: {e}")
-            return {
-                'identity_verification_level': 'none',
-                'identity_verified': False,
-                'verification_count': 0,
-                'credential_count': 0
-            }
+            return dict(_DEFAULT_IDENTITY_FEATURES)
+    
+    async def _get_address_map(self):
+        """
+        Get the EVM -> IOTA address index built from ADDRESS_MAPPING messages.
+        
+        The messages are decoded once per refresh rather than once per user;
+        the index is keyed by lowercased EVM address and keeps the first
+        mapping seen for each.
+        """
+        if not self.iota_client:
+            return {}
+        
+        address_map = self._cache_get('address_mapping', 'index')
+        if address_map is not _CACHE_MISS:
+            return address_map
+        
+        address_map = {}
+        for message in await self._get_tagged_messages('ADDRESS_MAPPING'):
+            try:
+                data = _decode_tagged_data(message)
+                address_map.setdefault(data['evmAddress'].lower(), data.get('iotaAddress'))
+            except:
+                continue
+        
+        self._response_caches['address_mapping']['index'] = address_map
+        return address_map
     
     async def _find_iota_address(self, evm_address):
         """Find the IOTA address corresponding to an EVM address."""
         try:
             # First check in the tangle for address mapping messages
-            tagged_messages = await self._get_tagged_messages('ADDRESS_MAPPING')
-            
-            for message in tagged_messages:
-                # Parse message data
-                try:
-                    data = json.loads(Buffer.from(message.data, 'hex').toString())
-                    if data.get('evmAddress', '').lower() == evm_address.lower():
-                        return data.get('iotaAddress')
-                except:
-                    continue
+            address_map = await self._get_address_map()
+            evm_lower = evm_address.lower()
+            if evm_lower in address_map:
+                return address_map[evm_lower]
             
             # If no mapping found, check in the lending pool contract
             if self.lending_pool:
                 try:
-                    iota_address = await self.lending_pool.functions.getIotaAddress(evm_address).call()
+                    iota_address = await self._rpc(self.lending_pool.functions.getIotaAddress(evm_address).call)
                     if iota_address and iota_address != '0x0000000000000000000000000000000000000000000000000000000000000000':
                         # Convert bytes32 to address string
-                        return self.w3.toText(iota_address).rstrip('\x00')
+                        return self.w3.to_text(iota_address).rstrip('\x00')
                 except Exception as e:
                     logger.warning(f"Error getting IOTA address from contract: {e}")
             
@@ -436,68 +789,257 @@ class BlockchainDataCollector:
             
     async def _get_real_transactions(self, address, limit=100):
         """Get real historical transactions for an address from the blockchain."""
+        cached = self._cache_get('transactions', (address, limit))
+        if cached is not _CACHE_MISS:
+            return cached
+        
         try:
             transactions = []
             
             # Get the current block number
-            current_block = self.w3.eth.block_number
-            
-            # Calculate the starting block (default to 1000 blocks back)
-            start_block = max(0, current_block - 200_000)  # Look back 200k blocks
-            
-            # Use eth_getLogs to find transactions involving this address
-            # This is more efficient than scanning all blocks
-            from_filter = {
-                'fromBlock': start_block,
-                'toBlock': 'latest',
-                'address': address,
-            }
+            current_block = await self._get_block_number()
+            
+            # Calculate the starting block
+            start_block = max(0, current_block - _LOG_LOOKBACK_BLOCKS)
+            
+            # Finalized history persisted by an earlier scan stands in for the
+            # start of this one when it reaches back to the window's first block
+            scan_from = start_block
+            persisted = await asyncio.to_thread(self._load_persisted_transactions, address)
+            if persisted is not None:
+                persisted_transactions, covered_from, covered_to = persisted
+                if covered_from <= start_block:
+                    transactions = [
+                        tx for tx in persisted_transactions if tx['block_number'] >= start_block
+                    ][:limit]
+                    scan_from = max(start_block, covered_to + 1)
+            needed = limit - len(transactions)
+            
+            # Use eth_getLogs to find transactions involving this address,
+            # oldest windows first, stopping once enough logs are collected
+            logs = []
+            complete_to = scan_from - 1
+            if needed > 0:
+                async for complete_to, window_logs in self._iter_logs(address, scan_from, current_block):
+                    logs.extend(window_logs)
+                    if len(logs) >= needed:
+                        break
+                if len(logs) > needed:
+                    # Logs past the limit are dropped, so only the blocks before
+                    # the first dropped one count as fully read
+                    complete_to = min(complete_to, logs[needed]['blockNumber'] - 1)
+                logs = logs[:needed]
+            
+            # Fetch each distinct transaction and receipt concurrently over the
+            # pooled session instead of three sequential round-trips per log
+            tx_hashes = [log.get('transactionHash') for log in logs]
+            tx_hashes = [tx_hash for tx_hash in tx_hashes if tx_hash]
+            unique_hashes = list(dict.fromkeys(tx_hashes))
+            txs_and_receipts = await asyncio.gather(
+                *[self._rpc(self.w3.eth.get_transaction, tx_hash) for tx_hash in unique_hashes],
+                *[self._rpc(self.w3.eth.get_transaction_receipt, tx_hash) for tx_hash in unique_hashes]
+            )
+            txs = dict(zip(unique_hashes, txs_and_receipts[:len(unique_hashes)]))
+            receipts = dict(zip(unique_hashes, txs_and_receipts[len(unique_hashes):]))
             
-            # Use batch requests to get logs
-            logs = await self._get_logs(from_filter)
+            # Blocks are only needed for their timestamps, once per block
+            block_timestamps = await self._get_block_timestamps(tx.blockNumber for tx in txs.values())
             
             # Process logs to extract transaction info
-            for log in logs[:limit]:
-                tx_hash = log.get('transactionHash')
-                if tx_hash:
-                    # Get transaction details
-                    tx = self.w3.eth.get_transaction(tx_hash)
-                    receipt = self.w3.eth.get_transaction_receipt(tx_hash)
-                    block = self.w3.eth.get_block(tx.blockNumber)
-                    
-                    # Extract relevant information
-                    transactions.append({
-                        'hash': tx_hash.hex(),
-                        'from': tx.get('from'),
-                        'to': tx.get('to'),
-                        'value': tx.get('value'),
-                        'block_number': tx.blockNumber,
-                        'timestamp': block.timestamp,
-                        'gas_used': receipt.gasUsed,
-                        'status': receipt.status
-                    })
+            for tx_hash in tx_hashes:
+                tx = txs[tx_hash]
+                receipt = receipts[tx_hash]
+                
+                # Extract relevant information
+                transactions.append({
+                    'hash': tx_hash.hex(),
+                    'from': tx.get('from'),
+                    'to': tx.get('to'),
+                    'value': tx.get('value'),
+                    'block_number': tx.blockNumber,
+                    'timestamp': block_timestamps[tx.blockNumber],
+                    'gas_used': receipt.gasUsed,
+                    'status': receipt.status
+                })
+            
+            # Persist the part of the history that is both fully read and final
+            persist_to = min(complete_to, current_block - _FINALITY_DEPTH)
+            if persist_to >= scan_from:
+                await asyncio.to_thread(
+                    self._persist_transactions,
+                    address,
+                    [tx for tx in transactions if tx['block_number'] <= persist_to],
+                    start_block,
+                    persist_to
+                )
             
             logger.info(f"Found {len(transactions)} real transactions for {address}")
+            self._response_caches['transactions'][(address, limit)] = transactions
             return transactions
         except Exception as e:
             logger.error(f"Error getting real transactions: {e}")
             # Fallback to a small set of transactions
             return await self._get_fallback_transactions(address, limit)
     
+    async def _get_block_number(self):
+        """Get the current block number, reusing it for a few seconds."""
+        block_number = self._cache_get('block_number', 'latest')
+        if block_number is _CACHE_MISS:
+            block_number = await self._rpc(self.w3.eth.get_block_number)
+            self._response_caches['block_number']['latest'] = block_number
+        return block_number
+    
+    async def _get_block_timestamps(self, block_numbers):
+        """Map each distinct block number to its timestamp, fetching the blocks concurrently."""
+        block_numbers = list(dict.fromkeys(block_numbers))
+        blocks = await asyncio.gather(
+            *[self._rpc(self.w3.eth.get_block, block_number) for block_number in block_numbers]
+        )
+        return {
+            block_number: block.timestamp
+            for block_number, block in zip(block_numbers, blocks)
+        }
+    
+    async def _iter_logs(self, address, from_block, to_block, step=_LOG_WINDOW_BLOCKS):
+        """
+        Yield an address's logs in block order, one wave of windows at a time.
+        
+        The range is split into `step`-block windows and up to
+        _LOG_WINDOWS_IN_FLIGHT of them are fetched concurrently per wave.
+        Each wave yields (complete_to, logs): complete_to is the last block up
+        to which every window so far was read, and windows that failed
+        contribute no logs.
+        """
+        complete_to = from_block - 1
+        window_starts = range(from_block, to_block + 1, step)
+        for i in range(0, len(window_starts), _LOG_WINDOWS_IN_FLIGHT):
+            windows = [
+                (window_start, min(window_start + step - 1, to_block))
+                for window_start in window_starts[i:i + _LOG_WINDOWS_IN_FLIGHT]
+            ]
+            wave = await asyncio.gather(*[
+                self._get_logs({
+                    'fromBlock': window_start,
+                    'toBlock': window_end,
+                    'address': address,
+                })
+                for window_start, window_end in windows
+            ])
+            
+            logs = []
+            for (window_start, window_end), window_logs in zip(windows, wave):
+                if window_logs is None:
+                    continue
+                logs.extend(window_logs)
+                if complete_to == window_start - 1:
+                    complete_to = window_end
+            yield complete_to, logs
+    
+    async def _get_event_logs(self, event, argument_filters, from_block, to_block):
+        """
+        Read a contract event's logs over [from_block, to_block] in block order.
+        
+        Uses the same _LOG_WINDOW_BLOCKS windows as _iter_logs, fetched
+        _LOG_WINDOWS_IN_FLIGHT at a time. Unlike _iter_logs a failed window
+        raises, since callers count these events and can't use a partial history.
+        """
+        logs = []
+        window_starts = range(from_block, to_block + 1, _LOG_WINDOW_BLOCKS)
+        for i in range(0, len(window_starts), _LOG_WINDOWS_IN_FLIGHT):
+            wave = await asyncio.gather(*[
+                self._rpc(
+                    event.get_logs,
+                    argument_filters=argument_filters,
+                    fromBlock=window_start,
+                    toBlock=min(window_start + _LOG_WINDOW_BLOCKS - 1, to_block)
+                )
+                for window_start in window_starts[i:i + _LOG_WINDOWS_IN_FLIGHT]
+            ])
+            for window_logs in wave:
+                logs.extend(window_logs)
+        return logs
+    
     async def _get_logs(self, filter_params):
-        """Get logs from the blockchain with rate limiting and retries."""
+        """Get logs from the blockchain with rate limiting and retries; None if they could not be read."""
         try:
-            logs = self.w3.eth.get_logs(filter_params)
+            logs = await self._rpc(self.w3.eth.get_logs, filter_params)
             return logs
         except Exception as e:
             logger.error(f"Error getting logs: {e}")
-            return []
+            return None
+    
+    def _load_persisted_transactions(self, address):
+        """
+        Read an address's persisted transaction history.
+        
+        Returns:
+            (transactions, covered_from, covered_to) where every log in
+            [covered_from, covered_to] is included, or None if nothing usable
+            is on disk
+        """
+        if self._tx_cache_dir is None:
+            return None
+        
+        path = self._tx_cache_dir / f"{address.lower()}.parquet"
+        try:
+            table = pq.read_table(path)
+            metadata = table.schema.metadata
+            covered_from = int(metadata[b'covered_from'])
+            covered_to = int(metadata[b'covered_to'])
+            transactions = table.to_pylist()
+            # Touch the file so eviction treats it as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable transaction cache {path}: {e}")
+            return None
+        
+        for tx in transactions:
+            tx['value'] = int(tx['value'])
+        return transactions, covered_from, covered_to
+    
+    def _persist_transactions(self, address, transactions, covered_from, covered_to):
+        """Write an address's finalized transaction history, then enforce the cache size quota."""
+        if self._tx_cache_dir is None:
+            return
+        
+        try:
+            table = pa.Table.from_pylist(
+                [{**tx, 'value': str(tx['value'])} for tx in transactions],
+                schema=_TX_CACHE_SCHEMA
+            ).replace_schema_metadata({
+                'covered_from': str(covered_from),
+                'covered_to': str(covered_to)
+            })
+            self._tx_cache_dir.mkdir(parents=True, exist_ok=True)
+            pq.write_table(table, self._tx_cache_dir / f"{address.lower()}.parquet", compression='zstd')
+            self._evict_persisted_transactions()
+        except Exception as e:
+            logger.warning(f"Could not persist transactions for {address}: {e}")
+    
+    def _evict_persisted_transactions(self):
+        """Remove least recently used history files until the cache fits its quota."""
+        files = []
+        for path in self._tx_cache_dir.glob('*.parquet'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        
+        total_size = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total_size <= _ENV.tx_cache_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
             
     async def _get_fallback_transactions(self, address, limit=10):
         """Generate fallback transactions when real data can't be fetched."""
         transactions = []
-        current_block = self.w3.eth.block_number
-        current_timestamp = int(datetime.now().timestamp())
+        current_block = await self._get_block_number()
+        current_timestamp = int(time.time())
         
         for i in range(min(10, limit)):
             is_outgoing = i % 2 == 0
@@ -509,7 +1051,7 @@ class BlockchainDataCollector:
                 'hash': f"0x{i:064x}",
                 'from': address if is_outgoing else f"0x{'a'*40}",
                 'to': f"0x{'a'*40}" if is_outgoing else address,
-                'value': self.w3.toWei(0.1 * (i+1), 'ether'),
+                'value': self.w3.to_wei(0.1 * (i+1), 'ether'),
                 'block_number': block_number,
                 'timestamp': timestamp,
                 'gas_used': 21000,
@@ -519,51 +1061,63 @@ class BlockchainDataCollector:
         
         return transactions
     
-    async def _calculate_tx_frequency(self, transactions):
+    async def _calculate_tx_frequency(self, transactions, sorted_timestamps=None):
         """Calculate transaction frequency (transactions per day)."""
         if not transactions or len(transactions) < 2:
             return 0
         
-        # Sort transactions by timestamp
-        sorted_tx = sorted(transactions, key=lambda x: x.get('timestamp', 0))
+        # Sort transactions by timestamp unless the caller already has
+        if sorted_timestamps is None:
+            _, sorted_timestamps = _timestamp_order(transactions)
         
         # Get time range
-        first_tx = sorted_tx[0].get('timestamp', 0)
-        last_tx = sorted_tx[-1].get('timestamp', 0)
+        first_tx = sorted_timestamps[0]
+        last_tx = sorted_timestamps[-1]
         
         time_range_days = (last_tx - first_tx) / 86400  # Convert seconds to days
         if time_range_days < 1:
             time_range_days = 1  # Avoid division by zero
         
-        return len(transactions) / time_range_days
+        return float(len(transactions) / time_range_days)
     
-    async def _calculate_balance_volatility(self, address, transactions):
+    async def _calculate_balance_volatility(self, address, transactions, order=None):
         """Calculate the volatility of the wallet balance using real transaction data."""
         try:
             if not transactions or len(transactions) < 3:
                 return 0.0
                 
-            # Sort transactions by timestamp
-            sorted_tx = sorted(transactions, key=lambda x: x.get('timestamp', 0))
+            # Sort transactions by timestamp unless the caller already has
+            if order is None:
+                order, _ = _timestamp_order(transactions)
             
             # Reconstruct historical balances
-            balances = []
-            current_balance = self.w3.eth.get_balance(address)
-            balances.append(current_balance)
-            
-            # Work backwards through transactions to estimate historical balances
-            for tx in reversed(sorted_tx):
-                if tx.get('from', '').lower() == address.lower():
-                    # Outgoing tx, so add the value and gas cost to previous balance
-                    current_balance += tx.get('value', 0) + (tx.get('gas_used', 21000) * tx.get('gas_price', self.w3.eth.gas_price))
-                elif tx.get('to', '').lower() == address.lower():
-                    # Incoming tx, so subtract the value from previous balance
-                    current_balance -= tx.get('value', 0)
-                
-                balances.append(max(0, current_balance))  # Ensure non-negative balance
+            current_balance = await self._rpc(self.w3.eth.get_balance, address)
+            gas_price = await self._rpc(lambda: self.w3.eth.gas_price)
+            
+            # Work backwards through transactions to estimate historical balances:
+            # outgoing txs add back value and gas cost, incoming txs subtract value
+            address_lower = address.lower()
+            reversed_tx = [transactions[i] for i in order[::-1]]
+            directions = np.array([
+                1 if tx.get('from', '').lower() == address_lower
+                else -1 if tx.get('to', '').lower() == address_lower
+                else 0
+                for tx in reversed_tx
+            ], dtype=np.float64)
+            values = np.array([tx.get('value', 0) for tx in reversed_tx], dtype=np.float64)
+            gas_costs = np.array(
+                [tx.get('gas_used', 21000) * tx.get('gas_price', gas_price) for tx in reversed_tx],
+                dtype=np.float64
+            )
+            deltas = directions * values + (directions > 0) * gas_costs
+            
+            balances_array = np.empty(len(reversed_tx) + 1)
+            balances_array[0] = current_balance
+            # Ensure non-negative balance
+            np.maximum(current_balance + np.cumsum(deltas), 0, out=balances_array[1:])
             
             # Calculate volatility as coefficient of variation
-            balances_array = np.array(balances) / 1e18  # Convert to ether for better scaling
+            balances_array /= 1e18  # Convert to ether for better scaling
             std_dev = np.std(balances_array)
             mean = np.mean(balances_array)
             
@@ -575,52 +1129,52 @@ class BlockchainDataCollector:
             logger.error(f"Error calculating balance volatility: {e}")
             return 0.1  # Default low volatility
     
-    async def _calculate_wallet_age(self, transactions):
+    async def _calculate_wallet_age(self, transactions, now_timestamp=None):
         """Calculate the age of the wallet in days from transaction history."""
         if not transactions:
             return 0
-            
-        # Find oldest transaction
-        sorted_tx = sorted(transactions, key=lambda x: x.get('timestamp', float('inf')))
-        oldest_timestamp = sorted_tx[0].get('timestamp', int(datetime.now().timestamp()))
+        
+        if now_timestamp is None:
+            now_timestamp = int(time.time())
+            
+        # Find oldest transaction; only its timestamp is needed, so no sort
+        oldest_timestamp = min(
+            (tx['timestamp'] for tx in transactions if 'timestamp' in tx),
+            default=now_timestamp
+        )
         
         # Calculate days since oldest transaction
-        days_since = (datetime.now().timestamp() - oldest_timestamp) / 86400
+        days_since = (now_timestamp - oldest_timestamp) / 86400
         return max(1, round(days_since))  # Minimum 1 day
     
     async def _get_defi_features(self, address):
         """Get DeFi-specific features from the lending pool contract."""
         try:
             if not self.lending_pool:
-                return {
-                    'loans_count': 0,
-                    'repayment_ratio': 0.5,
-                    'default_count': 0,
-                    'collateral_diversity': 0,
-                    'protocol_interactions': 0
-                }
+                return dict(_DEFAULT_DEFI_FEATURES)
+            
+            cached = self._cache_get('defi_features', address)
+            if cached is not _CACHE_MISS:
+                return cached
                 
-            # Get data from lending pool contract
-            borrows = await self.lending_pool.functions.borrows(address).call()
-            deposits = await self.lending_pool.functions.deposits(address).call()
-            collaterals = await self.lending_pool.functions.collaterals(address).call()
-            risk_score = await self.lending_pool.functions.riskScores(address).call()
-            
-            # Get borrow and repay events
-            borrow_filter = self.lending_pool.events.Borrow.createFilter(
-                fromBlock=0, argument_filters={'user': address}
-            )
-            repay_filter = self.lending_pool.events.Repay.createFilter(
-                fromBlock=0, argument_filters={'user': address}
+            # Get borrow, repay and liquidation events over a bounded lookback,
+            # read in eth_getLogs windows instead of filters installed from block 0
+            latest_block = await self._get_block_number()
+            start_block = max(0, latest_block - _DEFI_EVENT_LOOKBACK_BLOCKS)
+            events = self.lending_pool.events
+            
+            # Get data from lending pool contract alongside the event history
+            (
+                (borrows, deposits, collaterals, risk_score, collateral_assets),
+                borrow_events,
+                repay_events,
+                liquidation_events
+            ) = await asyncio.gather(
+                self._read_lending_pool(address),
+                self._get_event_logs(events.Borrow, {'user': address}, start_block, latest_block),
+                self._get_event_logs(events.Repay, {'user': address}, start_block, latest_block),
+                self._get_event_logs(events.Liquidation, {'borrower': address}, start_block, latest_block)
             )
-            liquidation_filter = self.lending_pool.events.Liquidation.createFilter(
-                fromBlock=0, argument_filters={'borrower': address}
-            )
-            
-            # Get events
-            borrow_events = borrow_filter.get_all_entries()
-            repay_events = repay_filter.get_all_entries()
-            liquidation_events = liquidation_filter.get_all_entries()
             
             # Calculate features
             loans_count = len(borrow_events)
@@ -635,13 +1189,12 @@ class BlockchainDataCollector:
                 repayment_ratio = min(1.0, total_repaid / total_borrowed)
                 
             # Get collateral information
-            collateral_assets = await self.lending_pool.functions.getUserCollateralAssets(address).call()
             collateral_diversity = len(collateral_assets)
             
             # Estimate protocol interactions as the total number of events
             protocol_interactions = len(borrow_events) + len(repay_events) + len(liquidation_events)
             
-            return {
+            defi_features = {
                 'loans_count': loans_count,
                 'repayment_ratio': repayment_ratio,
                 'default_count': default_count,
@@ -652,66 +1205,103 @@ class BlockchainDataCollector:
                 'current_collaterals': float(collaterals) / 1e18,
                 'current_risk_score': risk_score
             }
+            self._response_caches['defi_features'][address] = defi_features
+            return defi_features
         except Exception as e:
             logger.error(f"Error getting DeFi features: {e}")
-            return {
-                'loans_count': 0,
-                'repayment_ratio': 0.5,
-                'default_count': 0,
-                'collateral_diversity': 0,
-                'protocol_interactions': 0,
-                'current_borrows': 0,
-                'current_deposits': 0,
-                'current_collaterals': 0,
-                'current_risk_score': 50
-            }
+            return dict(_DEFAULT_DEFI_FEATURES)
             
+    async def _read_lending_pool(self, address):
+        """
+        Read the per-user lending pool state named in _LENDING_POOL_READS.
+        
+        With Multicall3 enabled all reads go out in a single eth_call through
+        aggregate3; otherwise they are issued concurrently.
+        """
+        if self.multicall is None:
+            return await asyncio.gather(*[
+                self._rpc(getattr(self.lending_pool.functions, name)(address).call)
+                for name in _LENDING_POOL_READS
+            ])
+        
+        calls = [
+            (self.lending_pool.address, False, self.lending_pool.encodeABI(fn_name=name, args=[address]))
+            for name in _LENDING_POOL_READS
+        ]
+        results = await self._rpc(self.multicall.functions.aggregate3(calls).call)
+        
+        values = []
+        for name, (_, return_data) in zip(_LENDING_POOL_READS, results):
+            output_types = [output['type'] for output in self.lending_pool.get_function_by_name(name).abi['outputs']]
+            values.append(self.w3.codec.decode(output_types, return_data)[0])
+        return values
+    
     async def _get_tagged_messages(self, tag_name):
         """Get messages with a specific tag from the IOTA Tangle."""
         try:
             if not self.iota_client:
                 return []
-                
-            # Convert tag to hex
-            tag_hex = Buffer.from(tag_name).toString('hex')
             
-            # Query for messages with this tag
-            messages = await getTaggedData(self.iota_client, tag_hex)
-            return messages
+            cached = self._cache_get('tagged_messages', tag_name)
+            if cached is not _CACHE_MISS:
+                return cached
+            
+            # Join a fetch another caller already started for this tag; the
+            # shield keeps one caller's cancellation from failing the others
+            fetch = self._tag_fetches.get(tag_name)
+            if fetch is None:
+                fetch = asyncio.ensure_future(self._fetch_tagged_messages(tag_name))
+                self._tag_fetches[tag_name] = fetch
+            return await asyncio.shield(fetch)
         except Exception as e:
             logger.error(f"Error getting tagged messages: {e}")
             return []
+    
+    async def _fetch_tagged_messages(self, tag_name):
+        """Query the Tangle for a tag's messages and cache them."""
+        try:
+            # Convert tag to hex
+            tag_hex = tag_name.encode().hex()
             
-    async def _get_user_tangle_data(self, evm_address):
+            # Query for messages with this tag
+            messages = await getTaggedData(self.iota_client, tag_hex)
+            self._response_caches['tagged_messages'][tag_name] = messages
+            return messages
+        finally:
+            self._tag_fetches.pop(tag_name, None)
+            
+    async def _get_tagged_messages_by_tag(self, tag_names, tagged_messages=None):
+        """Fetch messages for several tags concurrently, keyed by tag name, reusing prefetched ones."""
+        results = await asyncio.gather(
+            *[self._get_prefetched_messages(tag, tagged_messages) for tag in tag_names]
+        )
+        return dict(zip(tag_names, results))
+    
+    async def _get_prefetched_messages(self, tag_name, tagged_messages=None):
+        """Return messages for a tag from a prefetched mapping, fetching it if absent."""
+        if tagged_messages is not None and tag_name in tagged_messages:
+            return tagged_messages[tag_name]
+        return await self._get_tagged_messages(tag_name)
+    
+    async def _get_user_tangle_data(self, evm_address, tagged_messages=None):
         """Get all Tangle data related to a specific user address."""
         try:
             if not self.iota_client:
                 return []
                 
-            # Tags to search for
-            tags = [
-                'RISK_SCORE_UPDATE',
-                'VERIFICATION_STATUS',
-                'LOAN_STATUS',
-                'REPAYMENT',
-                'COLLATERAL_UPDATE',
-                'CROSS_LAYER_DEPOSIT',
-                'CROSS_LAYER_WITHDRAWAL'
-            ]
-            
             all_messages = []
+            evm_lower = evm_address.lower()
+            messages_by_tag = await self._get_tagged_messages_by_tag(_USER_TANGLE_TAGS, tagged_messages)
             
             # Search for each tag
-            for tag in tags:
-                messages = await self._get_tagged_messages(tag)
-                
+            for tag, messages in messages_by_tag.items():
                 # Filter messages related to this user
                 for message in messages:
                     try:
-                        data = json.loads(Buffer.from(message.data, 'hex').toString())
-                        if ('address' in data and data['address'].lower() == evm_address.lower()) or \
-                           ('evmAddress' in data and data['evmAddress'].lower() == evm_address.lower()) or \
-                           ('borrowerAddress' in data and data['borrowerAddress'].lower() == evm_address.lower()):
+                        data = _decode_tagged_data(message)
+                        if ('address' in data and data['address'].lower() == evm_lower) or \
+                           ('evmAddress' in data and data['evmAddress'].lower() == evm_lower) or \
+                           ('borrowerAddress' in data and data['borrowerAddress'].lower() == evm_lower):
                             # Add tag to the message
                             message['tag_name'] = tag
                             all_messages.append(message)
@@ -728,56 +1318,56 @@ class BlockchainDataCollector:
         try:
             # This would query the bridge contract for transactions
             # For now we'll use a simplified implementation
-            bridge_contract_address = os.environ.get('BRIDGE_ADDRESS', '0x0000000000000000000000000000000000000000')
+            bridge_contract_address = _ENV.bridge_address
             
-            if bridge_contract_address == '0x0000000000000000000000000000000000000000':
+            if bridge_contract_address == _ZERO_ADDRESS:
                 return []
                 
             # Load bridge contract ABI
             try:
-                with open('../../abis/CrossLayerBridge.json', 'r') as f:
-                    bridge_abi = json.load(f)
+                bridge_abi = _load_abi(_BRIDGE_ABI_PATH)
                     
                 bridge_contract = self.w3.eth.contract(
                     address=bridge_contract_address,
                     abi=bridge_abi
                 )
                 
-                # Get deposit and withdrawal events
-                deposit_filter = bridge_contract.events.DepositInitiated.createFilter(
-                    fromBlock=0, argument_filters={'sender': evm_address}
-                )
-                withdrawal_filter = bridge_contract.events.WithdrawalFinalized.createFilter(
-                    fromBlock=0, argument_filters={'recipient': evm_address}
+                # Get deposit and withdrawal events over a bounded lookback,
+                # read in fromBlock/toBlock windows
+                latest_block = await self._get_block_number()
+                start_block = max(0, latest_block - _BRIDGE_EVENT_LOOKBACK_BLOCKS)
+                events = bridge_contract.events
+                deposit_events, withdrawal_events = await asyncio.gather(
+                    self._get_event_logs(events.DepositInitiated, {'sender': evm_address}, start_block, latest_block),
+                    self._get_event_logs(events.WithdrawalFinalized, {'recipient': evm_address}, start_block, latest_block)
                 )
                 
-                # Get events
-                deposit_events = deposit_filter.get_all_entries()
-                withdrawal_events = withdrawal_filter.get_all_entries()
+                # Look up every block the events landed in at once
+                block_timestamps = await self._get_block_timestamps(
+                    event.blockNumber for event in (*deposit_events, *withdrawal_events)
+                )
                 
                 # Format events into transactions
                 transactions = []
                 
                 for event in deposit_events:
-                    block = self.w3.eth.get_block(event.blockNumber)
                     transactions.append({
                         'type': 'deposit',
                         'from': evm_address,
                         'to': event.args.l1Recipient,
                         'amount': event.args.amount,
-                        'timestamp': block.timestamp,
+                        'timestamp': block_timestamps[event.blockNumber],
                         'blockNumber': event.blockNumber,
                         'transactionHash': event.transactionHash.hex()
                     })
                     
                 for event in withdrawal_events:
-                    block = self.w3.eth.get_block(event.blockNumber)
                     transactions.append({
                         'type': 'withdrawal',
                         'from': event.args.l1Sender,
                         'to': evm_address,
                         'amount': event.args.amount,
-                        'timestamp': block.timestamp,
+                        'timestamp': block_timestamps[event.blockNumber],
                         'blockNumber': event.blockNumber,
                         'transactionHash': event.transactionHash.hex()
                     })
@@ -790,27 +1380,35 @@ class BlockchainDataCollector:
             logger.error(f"Error getting bridge transactions: {e}")
             return []
             
-    async def _get_cross_layer_messages(self, evm_address):
+    async def _get_cross_layer_messages(self, evm_address, tagged_messages=None):
         """Get cross-layer messages from the Tangle."""
         try:
             if not self.iota_client:
                 return []
                 
             # Get relevant tagged messages
-            deposit_messages = await self._get_tagged_messages('CROSS_LAYER_DEPOSIT')
-            withdrawal_messages = await self._get_tagged_messages('CROSS_LAYER_WITHDRAWAL')
+            messages_by_tag = await self._get_tagged_messages_by_tag(
+                ('CROSS_LAYER_DEPOSIT', 'CROSS_LAYER_WITHDRAWAL'), tagged_messages
+            )
             
             # Filter messages for this user
             user_messages = []
+            evm_lower = evm_address.lower()
             
-            for message in deposit_messages + withdrawal_messages:
+            tagged = [
+                (tag, message)
+                for tag, messages in messages_by_tag.items()
+                for message in messages
+            ]
+            
+            for tag, message in tagged:
                 try:
-                    data = json.loads(Buffer.from(message.data, 'hex').toString())
-                    if ('sender' in data and data['sender'].lower() == evm_address.lower()) or \
-                       ('recipient' in data and data['recipient'].lower() == evm_address.lower()):
+                    data = _decode_tagged_data(message)
+                    if ('sender' in data and data['sender'].lower() == evm_lower) or \
+                       ('recipient' in data and data['recipient'].lower() == evm_lower):
                         user_messages.append({
                             'type': 'cross_layer',
-                            'subtype': message['tag_name'],
+                            'subtype': tag,
                             'data': data,
                             'timestamp': data.get('timestamp', 0),
                             'messageId': message.messageId
@@ -823,22 +1421,23 @@ class BlockchainDataCollector:
             logger.error(f"Error getting cross-layer messages: {e}")
             return []
             
-    async def _get_verification_messages(self, evm_address):
+    async def _get_verification_messages(self, evm_address, tagged_messages=None):
         """Get identity verification messages for a user."""
         try:
             if not self.iota_client:
                 return []
                 
             # Get verification messages
-            verification_messages = await self._get_tagged_messages('VERIFICATION_STATUS')
+            verification_messages = await self._get_prefetched_messages('VERIFICATION_STATUS', tagged_messages)
             
             # Filter messages for this user
             user_messages = []
+            evm_lower = evm_address.lower()
             
             for message in verification_messages:
                 try:
-                    data = json.loads(Buffer.from(message.data, 'hex').toString())
-                    if data.get('ethereumAddress', '').lower() == evm_address.lower():
+                    data = _decode_tagged_data(message)
+                    if data.get('ethereumAddress', '').lower() == evm_lower:
                         user_messages.append({
                             'level': data.get('level', 'basic'),
                             'verified': data.get('verified', False),
@@ -853,27 +1452,30 @@ class BlockchainDataCollector:
             logger.error(f"Error getting verification messages: {e}")
             return []
             
-    async def _get_credential_messages(self, evm_address):
+    async def _get_credential_messages(self, evm_address, tagged_messages=None):
         """Get credential messages for a user."""
         try:
             if not self.iota_client or not self.iota_identity:
                 return []
                 
             # Get credential messages
-            credential_messages = await self._get_tagged_messages('CREDENTIAL')
+            credential_messages = await self._get_prefetched_messages('CREDENTIAL', tagged_messages)
             
             # Filter messages for this user
             user_messages = []
+            evm_lower = evm_address.lower()
+            # Credentials without an issuance date count as issued now
+            now_iso = datetime.now().isoformat()
             
             for message in credential_messages:
                 try:
-                    data = json.loads(Buffer.from(message.data, 'hex').toString())
-                    if data.get('subject', {}).get('id', '').lower() == evm_address.lower():
+                    data = _decode_tagged_data(message)
+                    if data.get('subject', {}).get('id', '').lower() == evm_lower:
                         user_messages.append({
                             'type': data.get('type', ['Credential'])[0],
                             'issuer': data.get('issuer', ''),
                             'issuanceDate': data.get('issuanceDate', ''),
-                            'timestamp': int(datetime.fromisoformat(data.get('issuanceDate', datetime.now().isoformat())).timestamp()),
+                            'timestamp': int(datetime.fromisoformat(data.get('issuanceDate', now_iso)).timestamp()),
                             'messageId': message.messageId
                         })
                 except:
@@ -912,7 +1514,8 @@ class BlockchainDataCollector:
         """
         try:
             # Validate address
-            evm_address = self.w3.to_checksum_address(address)
+            evm_address = _checksum_address(address)
+            await self._ensure_session()
             
             # Find IOTA address if requested
             iota_address = None
@@ -969,7 +1572,7 @@ class BlockchainDataCollector:
             on_chain_risk = 50  # Default medium risk
             if self.lending_pool:
                 try:
-                    on_chain_risk = await self.lending_pool.functions.riskScores(address).call()
+                    on_chain_risk = await self._rpc(self.lending_pool.functions.riskScores(address).call)
                 except:
                     pass
             
@@ -1027,7 +1630,7 @@ class BlockchainDataCollector:
 def get_user_features_sync(address, rpc_url=None, iota_node_url=None):
     """Synchronous wrapper for get_user_features."""
     collector = BlockchainDataCollector(rpc_url, iota_node_url)
-    loop = asyncio.new_event_loop()
+    loop = _new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         # Initialize IOTA client first
@@ -1039,6 +1642,7 @@ def get_user_features_sync(address, rpc_url=None, iota_node_url=None):
         logger.error(f"Error in sync wrapper: {e}")
         return {}
     finally:
+        loop.run_until_complete(collector.aclose())
         loop.close()
 
 
@@ -1046,7 +1650,7 @@ def get_user_features_sync(address, rpc_url=None, iota_node_url=None):
 def get_user_risk_data_sync(address, rpc_url=None, iota_node_url=None):
     """Synchronous wrapper for get_user_risk_data."""
     collector = BlockchainDataCollector(rpc_url, iota_node_url)
-    loop = asyncio.new_event_loop()
+    loop = _new_event_loop()
     asyncio.set_event_loop(loop)
     try:
         # Initialize IOTA client first
@@ -1061,20 +1665,24 @@ def get_user_risk_data_sync(address, rpc_url=None, iota_node_url=None):
             'error': str(e)
         }
     finally:
+        loop.run_until_complete(collector.aclose())
         loop.close()
 
 
 # Test function
 if __name__ == '__main__':
     async def test():
-        collector = BlockchainDataCollector()
-        await collector._init_iota_client()
-        features = await collector.get_user_features("0x0000000000000000000000000000000000000000")
-        print("Features:")
-        print(json.dumps(features, indent=2))
-        
-        risk_data = await collector.get_user_risk_data("0x0000000000000000000000000000000000000000")
-        print("\nRisk Data:")
-        print(json.dumps(risk_data, indent=2))
+        async with BlockchainDataCollector() as collector:
+            await collector._init_iota_client()
+            features = await collector.get_user_features("0x0000000000000000000000000000000000000000")
+            print("Features:")
+            print(json.dumps(features, indent=2))
+            
+            risk_data = await collector.get_user_risk_data("0x0000000000000000000000000000000000000000")
+            print("\nRisk Data:")
+            print(json.dumps(risk_data, indent=2))
     
-    asyncio.run(test())
+    if uvloop is not None:
+        uvloop.run(test())
+    else:
+        asyncio.run(test())
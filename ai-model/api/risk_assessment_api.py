@@ -7,19 +7,23 @@ allowing integration with other systems and web access to the risk assessment fu
 
 import os
 import sys
+import asyncio
+import importlib.util
 import logging
 import json
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, Body, Query, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
 # Add parent directory to path to import the model
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from enhanced_iota_risk_model import EnhancedIOTARiskModel, assess_risk_sync
+from enhanced_iota_risk_model import EnhancedIOTARiskModel, assess_risk_sync, get_risk_model
 
 # Configure logging
 logging.basicConfig(
@@ -32,11 +36,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# orjson encodes responses much faster than the stdlib encoder
+if importlib.util.find_spec("orjson") is not None:
+    default_response_class = ORJSONResponse
+else:
+    default_response_class = JSONResponse
+
 # Initialize FastAPI app
 app = FastAPI(
     title="IOTA Risk Assessment API",
     description="Advanced risk assessment for DeFi on IOTA using machine learning",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=default_response_class
 )
 
 # Add CORS middleware
@@ -48,23 +59,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Model instance - will be lazy-loaded
-model = None
-
 def get_model():
-    """Get or initialize the risk model."""
-    global model
-    if model is None:
+    """Get the shared risk model, loading it on first use."""
+    try:
+        return get_risk_model()
+    except Exception as e:
+        logger.error(f"Error initializing model: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to initialize risk assessment model: {str(e)}"
+        )
+
+@app.on_event("startup")
+def load_model():
+    """Load the model when a worker starts instead of on its first request."""
+    logger.info("Initializing IOTA Risk Assessment Model")
+    try:
+        get_model()
+    except HTTPException:
+        # Already logged; requests will retry the load
+        pass
+
+# Assessments are queued and scored in batches by a single loop per worker, so
+# concurrent requests share one model call instead of contending for the model
+BATCH_SIZE = int(os.environ.get("AI_BATCH_SIZE", 16))
+BATCH_WAIT = int(os.environ.get("AI_BATCH_WAIT_MS", 20)) / 1000
+
+model_queue: Optional[asyncio.Queue] = None
+_server_task: Optional[asyncio.Task] = None
+
+async def server_loop(queue: asyncio.Queue):
+    """Drain queued assessments in batches and score each batch with one model call."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_WAIT
+        
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
         try:
-            logger.info("Initializing IOTA Risk Assessment Model")
-            model = EnhancedIOTARiskModel()
+            model = get_model()
+            results = await run_in_threadpool(model.assess_risk_batch, [data for data, _ in batch])
         except Exception as e:
-            logger.error(f"Error initializing model: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to initialize risk assessment model: {str(e)}"
-            )
-    return model
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+@app.on_event("startup")
+async def start_server_loop():
+    """Start this worker's batching loop."""
+    global model_queue, _server_task
+    model_queue = asyncio.Queue()
+    _server_task = asyncio.create_task(server_loop(model_queue))
 
 # Input and output models
 class UserData(BaseModel):
@@ -145,10 +202,7 @@ async def health_check():
     }
 
 @app.post("/assess-risk", response_model=RiskAssessmentResponse, tags=["Risk Assessment"])
-async def assess_risk(
-    user_data: UserData,
-    model: EnhancedIOTARiskModel = Depends(get_model)
-):
+async def assess_risk(user_data: UserData):
     """
     Assess risk for a user based on provided data.
     
@@ -162,8 +216,11 @@ async def assess_risk(
         # Convert Pydantic model to dict
         user_data_dict = user_data.dict(exclude_unset=True)
         
-        # Run risk assessment
-        result = model.assess_risk(user_data_dict)
+        # Run risk assessment in the next batch; server_loop loads the model
+        # and reports a load failure through the future
+        future = asyncio.get_running_loop().create_future()
+        await model_queue.put((user_data_dict, future))
+        result = await future
         
         # Convert result to response model
         return result
@@ -175,7 +232,7 @@ async def assess_risk(
         )
 
 @app.post("/train", response_model=TrainingMetrics, tags=["Model Management"])
-async def train_model(
+def train_model(
     file: str = Body(..., embed=True, description="Path to training data CSV file"),
     model: EnhancedIOTARiskModel = Depends(get_model)
 ):
@@ -211,7 +268,7 @@ async def train_model(
         )
 
 @app.get("/model-info", tags=["Model Management"])
-async def model_info(model: EnhancedIOTARiskModel = Depends(get_model)):
+def model_info(model: EnhancedIOTARiskModel = Depends(get_model)):
     """Get information about the current model."""
     try:
         # Get model configuration and status
@@ -246,5 +303,9 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     host = os.environ.get("HOST", "0.0.0.0")
     
+    # Auto-reload is for development and can't be combined with multiple workers
+    reload = os.environ.get("RELOAD", "false").lower() == "true"
+    workers = None if reload else int(os.environ.get("WORKERS", os.cpu_count() or 1))
+    
     logger.info(f"Starting IOTA Risk Assessment API on {host}:{port}")
-    uvicorn.run("risk_assessment_api:app", host=host, port=port, reload=True)
+    uvicorn.run("risk_assessment_api:app", host=host, port=port, reload=reload, workers=workers)
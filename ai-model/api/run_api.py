@@ -33,10 +33,25 @@ def main():
     env["FLASK_APP"] = app_path
     env["FLASK_ENV"] = "development" if debug else "production"
     
-    # Run Flask app
+    # Serve with gunicorn workers in production; the Flask development server is
+    # kept for debugging and for Windows, where gunicorn is unavailable
+    if debug or os.name == "nt":
+        server_cmd = [sys.executable, app_path]
+    else:
+        workers = os.environ.get("AI_API_WORKERS", str(os.cpu_count() or 1))
+        threads = os.environ.get("AI_API_THREADS", "4")
+        server_cmd = [
+            sys.executable, "-m", "gunicorn",
+            "--chdir", current_dir,
+            "--workers", workers,
+            "--worker-class", "gthread",
+            "--threads", threads,
+            "--bind", f"{host}:{port}",
+            "wsgi:app"
+        ]
+    
     try:
-        flask_cmd = ["python", app_path]
-        subprocess.run(flask_cmd, env=env)
+        subprocess.run(server_cmd, env=env)
     except KeyboardInterrupt:
         print("API server stopped")
     except Exception as e:
@@ -0,0 +1,25 @@
+"""
+WSGI entry point for the IntelliLend AI Risk Assessment API
+
+Run under gunicorn so requests are served by a pool of workers instead of the
+Flask development server, e.g.:
+
+    gunicorn --workers $(nproc) --worker-class gthread --threads 4 \
+        --bind 0.0.0.0:$AI_API_PORT wsgi:app
+
+Each worker imports this module and so warms its own risk model.
+"""
+
+import os
+import sys
+
+# Add API directory to path so the app module is importable from any cwd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, initialize_model, initialize_iota_connection
+
+# Initialize model
+initialize_model()
+
+# Initialize IOTA connection
+initialize_iota_connection()
@@ -57,7 +57,7 @@ class BehavioralAnalyzer:
             self.iota_connection = get_iota_connection(
                 self.config.get('iota_connection_config', 'config/iota_connection_config.json')
             )
-            logger.info(f"Connected to IOTA network: {self.iota_connection.is_connected}")
+            logger.info(f"Using IOTA network: {self.iota_connection.network}")
         except Exception as e:
             logger.error(f"Error connecting to IOTA network: {e}")
             logger.warning("Continuing with limited functionality")
@@ -57,7 +57,7 @@ class CollateralizationAdvisor:
             self.iota_connection = get_iota_connection(
                 self.config.get('iota_connection_config', 'config/iota_connection_config.json')
             )
-            logger.info(f"Connected to IOTA network: {self.iota_connection.is_connected}")
+            logger.info(f"Using IOTA network: {self.iota_connection.network}")
         except Exception as e:
             logger.error(f"Error connecting to IOTA network: {e}")
             logger.warning("Continuing with limited functionality")
@@ -349,7 +349,7 @@ class CollateralizationAdvisor:
         for asset in self.asset_volatility:
             try:
                 # Update with real-time data if IOTA connection available
-                if self.iota_connection and self.iota_connection.is_connected:
+                if self.iota_connection and self.iota_connection.ensure_connected():
                     logger.debug(f"Fetching real-time volatility data for {asset}")
                     volatility_data = self._fetch_asset_volatility(asset)
                     
@@ -50,6 +50,9 @@ class EnsembleRiskModel:
         # Load configuration
         self.config = self._load_config(config_path)
         
+        # IOTA-specific features passed through to the meta-learner
+        self.iota_specific_features = list(self.config.get("iota_specific_features", []))
+        
         # Initialize component models
         self.transformer_model = None
         self.gradient_boosting_model = None
@@ -238,11 +241,11 @@ class EnsembleRiskModel:
             predictions.append(np.zeros((len(data), 1)))
         
         # Add IOTA-specific features (these will help the meta-learner learn when to trust which model)
-        iota_features = self.config.get("iota_specific_features", [])
-        if len(iota_features) > 0:
+        if self.iota_specific_features:
             try:
                 # Check which features are actually in the data
-                available_features = [f for f in iota_features if f in data.columns]
+                columns = data.columns
+                available_features = [f for f in self.iota_specific_features if f in columns]
                 if available_features:
                     iota_feats = data[available_features].values
                     predictions.append(iota_feats)
@@ -326,8 +329,7 @@ class EnsembleRiskModel:
             }
             
             # Add feature importance if used
-            iota_features = self.config.get("iota_specific_features", [])
-            available_features = [f for f in iota_features if f in data.columns]
+            available_features = [f for f in self.iota_specific_features if f in data.columns]
             if available_features and len(coef) > 2:
                 for i, feature in enumerate(available_features):
                     if i + 2 < len(coef):
@@ -411,20 +413,9 @@ class EnsembleRiskModel:
         except Exception as e:
             logger.error(f"Error calculating model disagreement: {e}")
         
-        # Method 2: Distance from decision boundary for logistic regression
-        try:
-            if hasattr(self.meta_learner, 'decision_function'):
-                # Decision function distance correlates with confidence
-                decision_distances = np.abs(self.meta_learner.decision_function(X_meta))
-                # Normalize and invert (smaller distance = higher uncertainty)
-                max_distance = np.max(decision_distances) if len(decision_distances) > 0 else 1
-                if max_distance > 0:
-                    normalized_distances = decision_distances / max_distance
-                    uncertainties += (1 - normalized_distances)
-        except Exception as e:
-            logger.error(f"Error calculating decision boundary distance: {e}")
-        
-        # Method 3: Data quality factors from IOTA features
+        # Method 2: Data quality factors from IOTA features
+        # (each row is scored on its own, so a user's uncertainty does not depend
+        # on which other users are predicted in the same batch)
         try:
             # Check for specific features that might indicate uncertainty
             if "used_real_iota_data" in data.columns:
@@ -454,12 +445,19 @@ class EnsembleRiskModel:
         Returns:
             List of dictionaries with risk scores and classes
         """
+        if self.meta_learner is None:
+            raise ValueError("Meta-learner not trained or loaded")
+        
         use_uncertainty = self.config.get("use_uncertainty", True)
         
+        # Get base model predictions once for all rows; they feed the
+        # meta-learner, the uncertainty estimate and the component scores
+        X_meta = self._get_base_predictions(data)
+        risk_probs = self.meta_learner.predict_proba(X_meta)[:, 1]
+        
         if use_uncertainty:
-            risk_probs, uncertainties = self.predict_with_uncertainty(data)
+            uncertainties = self._calculate_uncertainty(data, X_meta)
         else:
-            risk_probs = self.predict(data)
             uncertainties = np.zeros(len(data))
         
         # Convert to risk scores (0-100)
@@ -469,36 +467,32 @@ class EnsembleRiskModel:
         thresholds = [20, 40, 60, 80]
         risk_classes = ["Very Low Risk", "Low Risk", "Medium Risk", "High Risk", "Very High Risk"]
         
+        # Determine risk classes for all scores at once: the class index is the
+        # number of thresholds each score meets
+        risk_class_indices = np.digitize(risk_scores, thresholds)
+        
+        timestamp = datetime.now().isoformat()
+        
         results = []
         for i, score in enumerate(risk_scores):
-            # Determine risk class
-            risk_class_idx = 0
-            for j, threshold in enumerate(thresholds):
-                if score >= threshold:
-                    risk_class_idx = j + 1
-            
             # Calculate confidence score
             confidence_score = 1.0 - uncertainties[i]
             
             # Get component model scores if available
             component_scores = {}
-            try:
-                X_meta = self._get_base_predictions(data.iloc[[i]])
-                if X_meta.shape[1] >= 2:
-                    component_scores = {
-                        "transformerScore": float(X_meta[0, 0] * 100),
-                        "gradientBoostingScore": float(X_meta[0, 1] * 100)
-                    }
-            except Exception as e:
-                logger.error(f"Error getting component scores: {e}")
+            if X_meta.shape[1] >= 2:
+                component_scores = {
+                    "transformerScore": float(X_meta[i, 0] * 100),
+                    "gradientBoostingScore": float(X_meta[i, 1] * 100)
+                }
             
             results.append({
                 "riskScore": float(score),
-                "riskClass": risk_classes[risk_class_idx],
+                "riskClass": risk_classes[risk_class_indices[i]],
                 "confidenceScore": float(confidence_score),
                 "uncertainty": float(uncertainties[i]),
                 "componentScores": component_scores,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             })
         
         return results
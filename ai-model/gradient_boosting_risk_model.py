@@ -19,6 +19,12 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Union, Tuple
 import joblib
 
+# ONNX Runtime serves predictions from an exported graph when available
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,12 +52,23 @@ class GradientBoostingRiskModel:
         # Load configuration
         self.config = self._load_config(config_path)
         
+        # Model input columns, in the order the scaler and model expect
+        self.features = list(self.config.get("features", []))
+        
         # Initialize feature preprocessing
         self.scaler = StandardScaler()
         
         # Initialize XGBoost model
         self.model = None
         
+        # Feature importances of the current model, filled in on first use
+        self._feature_importance = None
+        self._feature_importance_model = None
+        
+        # ONNX Runtime session for the current model, if one was exported
+        self._onnx_session = None
+        self._onnx_session_model = None
+        
         # Load model if available
         self._load_model()
         
@@ -109,6 +126,7 @@ class GradientBoostingRiskModel:
             if os.path.exists(model_path):
                 self.model = joblib.load(model_path)
                 logger.info(f"Model loaded from {model_path}")
+                self._load_onnx_session(model_path)
                 return True
             else:
                 logger.warning(f"Model file {model_path} not found.")
@@ -132,11 +150,59 @@ class GradientBoostingRiskModel:
             
             joblib.dump(self.model, model_path)
             logger.info(f"Model saved to {model_path}")
+            
+            if self._export_onnx(model_path):
+                self._load_onnx_session(model_path)
             return True
         except Exception as e:
             logger.error(f"Error saving model: {e}")
             return False
     
+    def _export_onnx(self, model_path: str) -> bool:
+        """Export the trained model to ONNX next to its joblib file, if onnxmltools is installed."""
+        try:
+            from onnxmltools import convert_xgboost
+            from onnxmltools.convert.common.data_types import FloatTensorType
+        except ImportError:
+            return False
+        
+        try:
+            n_features = len(self.features)
+            onnx_model = convert_xgboost(self.model, initial_types=[('X', FloatTensorType([None, n_features]))])
+            
+            onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+            with open(onnx_path, 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            logger.info(f"ONNX model exported to {onnx_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Error exporting model to ONNX: {e}")
+            return False
+    
+    def _load_onnx_session(self, model_path: str):
+        """Open an ONNX Runtime session for the model's exported graph, if there is one."""
+        self._onnx_session = None
+        self._onnx_session_model = None
+        
+        onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+        if ort is None or not os.path.exists(onnx_path):
+            return
+        
+        try:
+            options = ort.SessionOptions()
+            # Serving workers provide the parallelism; one thread each avoids oversubscription
+            options.intra_op_num_threads = self.config.get("onnx_intra_op_threads", 1)
+            session = ort.InferenceSession(onnx_path, sess_options=options, providers=['CPUExecutionProvider'])
+            
+            output_names = [output.name for output in session.get_outputs()]
+            self._onnx_input = session.get_inputs()[0].name
+            self._onnx_output = 'probabilities' if 'probabilities' in output_names else output_names[-1]
+            self._onnx_session = session
+            self._onnx_session_model = self.model
+            logger.info(f"ONNX Runtime session loaded from {onnx_path}")
+        except Exception as e:
+            logger.warning(f"Error loading ONNX model from {onnx_path}: {e}")
+    
     def preprocess_features(self, data: pd.DataFrame, fit: bool = False) -> np.ndarray:
         """
         Preprocess features for model training or prediction.
@@ -148,12 +214,12 @@ class GradientBoostingRiskModel:
         Returns:
             Preprocessed features as numpy array
         """
-        # Select features
-        features = self.config.get("features", [])
-        X = data[features].copy()
+        # Select features as a plain float array; the scaler and XGBoost work on
+        # ndarrays, so there is no need to carry a DataFrame further
+        X = data[self.features].to_numpy(dtype=np.float64, copy=True)
         
         # Handle missing values
-        X.fillna(0, inplace=True)
+        X[np.isnan(X)] = 0.0
         
         # Scale features
         if fit:
@@ -221,7 +287,7 @@ class GradientBoostingRiskModel:
             "recall": recall,
             "f1_score": f1,
             "feature_importance": dict(zip(
-                self.config.get("features", []),
+                self.features,
                 self.model.feature_importances_
             )),
             "training_samples": len(X_train),
@@ -323,7 +389,7 @@ class GradientBoostingRiskModel:
             "recall": recall,
             "f1_score": f1,
             "feature_importance": dict(zip(
-                self.config.get("features", []),
+                self.features,
                 self.model.feature_importances_
             )),
             "cv_results": grid_search.cv_results_,
@@ -347,6 +413,11 @@ class GradientBoostingRiskModel:
         # Preprocess features
         X = self.preprocess_features(data, fit=False)
         
+        # Use the exported graph if it was built from the current model
+        if self._onnx_session is not None and self._onnx_session_model is self.model:
+            probabilities = self._onnx_session.run([self._onnx_output], {self._onnx_input: X.astype(np.float32)})[0]
+            return probabilities[:, 1]
+        
         # Make predictions
         return self.model.predict_proba(X)[:, 1]
     
@@ -373,31 +444,48 @@ class GradientBoostingRiskModel:
         thresholds = [20, 40, 60, 80]
         risk_classes = ["Very Low Risk", "Low Risk", "Medium Risk", "High Risk", "Very High Risk"]
         
+        # Determine risk classes in one pass over the scores
+        risk_class_indices = np.digitize(risk_scores, thresholds)
+        
+        # Feature importance is a property of the model, not of each prediction
+        feature_importances = self.get_feature_importance()
+        
+        # All rows are predicted together, so they share one timestamp
+        timestamp = datetime.now().isoformat()
+        
         results = []
         for i, score in enumerate(risk_scores):
-            # Determine risk class
-            risk_class_idx = 0
-            for j, threshold in enumerate(thresholds):
-                if score >= threshold:
-                    risk_class_idx = j + 1
-            
-            # Get feature importance for this prediction
-            feature_importances = {}
-            if hasattr(self.model, 'feature_importances_'):
-                features = self.config.get("features", [])
-                for j, feature in enumerate(features):
-                    feature_importances[feature] = float(self.model.feature_importances_[j])
-            
             results.append({
                 "riskScore": float(score),
-                "riskClass": risk_classes[risk_class_idx],
+                "riskClass": risk_classes[risk_class_indices[i]],
                 "probability": float(risk_probs[i]),
-                "featureImportance": feature_importances,
-                "timestamp": datetime.now().isoformat()
+                "featureImportance": dict(feature_importances),
+                "timestamp": timestamp
             })
         
         return results
     
+    def get_feature_importance(self) -> Dict[str, float]:
+        """
+        Get the feature importances of the trained model.
+        
+        Importances only change when the model is trained or loaded, so they are
+        computed once per model instance.
+        
+        Returns:
+            Dictionary mapping feature names to importances
+        """
+        if self._feature_importance_model is not self.model:
+            feature_importances = {}
+            if hasattr(self.model, 'feature_importances_'):
+                for j, feature in enumerate(self.features):
+                    feature_importances[feature] = float(self.model.feature_importances_[j])
+            
+            self._feature_importance = feature_importances
+            self._feature_importance_model = self.model
+        
+        return self._feature_importance
+    
     def explain_prediction(self, data: pd.DataFrame, index: int = 0) -> Dict[str, Any]:
         """
         Explain a specific prediction using SHAP values.
@@ -431,7 +519,7 @@ class GradientBoostingRiskModel:
         shap_values = explainer.shap_values(X)
         
         # Get feature names
-        features = self.config.get("features", [])
+        features = self.features
         
         # Create explanation
         explanation = {
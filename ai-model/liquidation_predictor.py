@@ -63,7 +63,7 @@ class LiquidationPredictor:
             self.iota_connection = get_iota_connection(
                 self.config.get('iota_connection_config', 'config/iota_connection_config.json')
             )
-            logger.info(f"Connected to IOTA network: {self.iota_connection.is_connected}")
+            logger.info(f"Using IOTA network: {self.iota_connection.network}")
         except Exception as e:
             logger.error(f"Error connecting to IOTA network: {e}")
             logger.warning("Continuing with limited functionality")
@@ -170,7 +170,7 @@ class LiquidationPredictor:
         for asset in self.config.get('assets', ['IOTA']):
             try:
                 # Fetch real-time data if IOTA connection is available
-                if asset == 'IOTA' and self.iota_connection and self.iota_connection.is_connected:
+                if asset == 'IOTA' and self.iota_connection and self.iota_connection.ensure_connected():
                     # Get price data
                     price_data = self.iota_connection.get_token_price_history('IOTA', days=30)
                     
@@ -72,7 +72,7 @@ class PersonalizedRiskProfiler:
             self.iota_connection = get_iota_connection(
                 self.config.get('iota_connection_config', 'config/iota_connection_config.json')
             )
-            logger.info(f"Connected to IOTA network: {self.iota_connection.is_connected}")
+            logger.info(f"Using IOTA network: {self.iota_connection.network}")
         except Exception as e:
             logger.error(f"Error connecting to IOTA network: {e}")
             logger.warning("Continuing with limited functionality, some features may be unavailable")
@@ -247,7 +247,7 @@ class PersonalizedRiskProfiler:
         user_data.update(evm_data)
         
         # Collect IOTA data if address is provided and connection is available
-        if iota_address and self.iota_connection and self.iota_connection.is_connected:
+        if iota_address and self.iota_connection and self.iota_connection.ensure_connected():
             try:
                 logger.info(f"Fetching IOTA transaction history for {iota_address}")
                 iota_data = self.iota_connection.get_address_data(iota_address)
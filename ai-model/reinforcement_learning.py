@@ -531,6 +531,7 @@ class RLFineTuner:
         
         logger.info(f"Adjusting risk scores for {len(data)} samples")
         
+        timestamp = datetime.now().isoformat()
         results = []
         
         for i in range(len(data)):
@@ -551,7 +552,7 @@ class RLFineTuner:
                 "adjustment": float(adjustment),
                 "adjustedScore": float(adjusted_score),
                 "confidence": abs(float(q_value)) / 10.0,  # Scaled confidence
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             })
         
         logger.info(f"Risk score adjustment complete for {len(data)} samples")
@@ -0,0 +1,503 @@
+"""
+Unit tests for the AI-IOTA connection module
+"""
+
+import sys
+import os
+import io
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+import requests
+import numpy as np
+from unittest.mock import patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import ai_iota_connection
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ai_iota_connection import IOTAConnection, IOTAFeatures, FEATURE_ORDER, get_iota_connection, reset_iota_connection
+
+class TestIOTAConnection(unittest.TestCase):
+    """Test cases for the IOTA connection"""
+
+    def setUp(self):
+        """Set up a connection without touching the network"""
+        with patch.object(IOTAConnection, '_connect', return_value=True):
+            self.connection = IOTAConnection('nonexistent_config.json')
+        self.connection.is_connected = True
+
+    def tearDown(self):
+        """Release the pooled session"""
+        self.connection.close()
+
+    def _mock_response(self, status_code=200, payload=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.json.return_value = payload if payload is not None else {}
+        response.content = json.dumps(response.json.return_value).encode()
+        response.headers = {}
+        return response
+
+    def test_requests_use_pooled_session(self):
+        """Test that all HTTP methods are dispatched through the shared session"""
+        with patch.object(self.connection._session, 'request',
+                          return_value=self._mock_response()) as mock_request:
+            self.connection._make_request('https://node.example/health')
+            self.connection._make_request('https://node.example/api', method='post', data={'a': 1})
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args_list[0].args[0], 'GET')
+        self.assertEqual(mock_request.call_args_list[1].args[0], 'POST')
+        post_kwargs = mock_request.call_args_list[1].kwargs
+        self.assertIsInstance(post_kwargs['data'], bytes)
+        self.assertEqual(json.loads(post_kwargs['data']), {'a': 1})
+        self.assertEqual(post_kwargs['headers']['Content-Type'], 'application/json')
+        self.assertIsNone(mock_request.call_args_list[0].kwargs['data'])
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_retry_backoff_uses_full_jitter(self, mock_sleep):
+        """Test that retry delays are jittered and bounded by the exponential cap"""
+        self.connection._retry_count = 3
+        self.connection._retry_delay = 1.0
+        failures = [requests.ConnectionError('boom')] * 3 + [self._mock_response()]
+        with patch.object(self.connection._session, 'request', side_effect=failures):
+            response = self.connection._make_request('https://node.example/health')
+
+        self.assertEqual(response.status_code, 200)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 3)
+        for attempt, delay in enumerate(delays):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 2 ** attempt)
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_retry_after_header_is_respected(self, mock_sleep):
+        """Test that throttled responses wait at least Retry-After seconds"""
+        throttled = self._mock_response(status_code=429)
+        throttled.headers = {'Retry-After': '7'}
+        ok = self._mock_response()
+        with patch.object(self.connection._session, 'request', side_effect=[throttled, ok]):
+            response = self.connection._make_request('https://node.example/health')
+
+        self.assertIs(response, ok)
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 7)
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_retry_after_is_capped(self, mock_sleep):
+        """Test that a long Retry-After hint never waits past the retry cap"""
+        self.connection._retry_cap = 5.0
+        throttled = self._mock_response(status_code=503)
+        throttled.headers = {'Retry-After': '3600'}
+        with patch.object(self.connection._session, 'request', side_effect=[throttled, self._mock_response()]):
+            self.connection._make_request('https://node.example/health')
+
+        self.assertEqual(mock_sleep.call_args.args[0], 5.0)
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_retried_streamed_responses_are_closed(self, mock_sleep):
+        """Test that a retried response releases its connection before the next attempt"""
+        unavailable = self._mock_response(status_code=503)
+        ok = self._mock_response()
+        with patch.object(self.connection._session, 'request', side_effect=[unavailable, ok]) as mock_request:
+            response = self.connection._make_request('https://node.example/api', stream=True)
+
+        self.assertIs(response, ok)
+        self.assertTrue(mock_request.call_args.kwargs['stream'])
+        unavailable.close.assert_called_once()
+        ok.close.assert_not_called()
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_mutating_retries_reuse_idempotency_key(self, mock_sleep):
+        """Test that POST retries carry the same idempotency key"""
+        failures = [requests.Timeout('slow'), self._mock_response()]
+        with patch.object(self.connection._session, 'request', side_effect=failures) as mock_request:
+            self.connection._make_request('https://node.example/api', method='POST', data={})
+
+        keys = [c.kwargs['headers']['Idempotency-Key'] for c in mock_request.call_args_list]
+        self.assertEqual(len(keys), 2)
+        self.assertEqual(keys[0], keys[1])
+
+    def test_non_transient_errors_are_not_retried(self):
+        """Test that unexpected exceptions propagate without retrying"""
+        with patch.object(self.connection._session, 'request', side_effect=ValueError('bad')) as mock_request:
+            with self.assertRaises(ValueError):
+                self.connection._make_request('https://node.example/health')
+
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_probe_nodes_returns_first_healthy_node(self):
+        """Test that parallel probing picks a healthy node and penalises failures"""
+        bad_node, good_node = self.connection.nodes[0], self.connection.nodes[1]
+
+        def fake_get(url, headers, timeout):
+            if url.startswith(good_node):
+                return self._mock_response()
+            raise ConnectionError('unreachable')
+
+        with patch.object(self.connection._session, 'get', side_effect=fake_get):
+            healthy = self.connection._probe_nodes([bad_node, good_node], timeout=1)
+
+        self.assertEqual(healthy, good_node)
+        self.assertEqual(self.connection.node_health[good_node]['failure_count'], 0)
+
+    @patch('ai_iota_connection.time.sleep')
+    def test_connect_retries_use_jittered_backoff(self, mock_sleep):
+        """Test that failed connection rounds back off with the shared jittered delay"""
+        self.connection._connect_attempts = 3
+        self.connection._connect_delay = 1.0
+        with patch.object(self.connection, '_probe_nodes', return_value=None) as mock_probe:
+            self.assertFalse(self.connection._connect())
+
+        self.assertEqual(mock_probe.call_count, 3)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        for attempt, delay in enumerate(delays):
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 2 ** attempt)
+
+    def test_connect_delay_is_converted_from_milliseconds(self):
+        """Test that the configured retry_delay (ms) becomes a connect delay in seconds"""
+        with patch.object(IOTAConnection, '_connect', return_value=True), \
+             patch.object(IOTAConnection, '_load_config',
+                          return_value={'nodes': ['https://node.example'], 'retry_delay': 1500}):
+            connection = IOTAConnection('nonexistent_config.json')
+
+        self.assertEqual(connection._connect_delay, 1.5)
+        self.assertEqual(connection._retry_delay, 1.5)
+        connection.close()
+
+    def test_switch_to_next_healthy_node(self):
+        """Test failover to the next healthy node after repeated failures"""
+        first, second = self.connection.nodes[0], self.connection.nodes[1]
+        self.connection.current_node_index = 0
+        for _ in range(3):
+            self.connection._mark_node_unhealthy(first)
+
+        self.assertFalse(self.connection.node_health[first]['healthy'])
+        self.assertTrue(self.connection._switch_to_healthy_node())
+        self.assertEqual(self.connection.nodes[self.connection.current_node_index], second)
+
+    def test_failover_reconnect_holds_connect_lock(self):
+        """Test that reconnecting after every node failed is serialized with lazy connects"""
+        for node in self.connection.nodes:
+            for _ in range(3):
+                self.connection._mark_node_unhealthy(node)
+
+        def fake_connect():
+            self.assertTrue(self.connection._connect_lock.locked())
+            return True
+
+        with patch.object(self.connection, '_connect', side_effect=fake_connect) as mock_connect:
+            self.assertTrue(self.connection._switch_to_healthy_node())
+
+        mock_connect.assert_called_once()
+
+    def test_node_info_is_cached_per_node(self):
+        """Test that node info is fetched once per node within the cache TTL"""
+        info = self._mock_response(payload={'data': {'network': 'testnet', 'version': '2.0'}})
+        with patch.object(self.connection, '_make_request', return_value=info) as mock_request:
+            first = self.connection._get_node_info()
+            second = self.connection._get_node_info()
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first['version'], '2.0')
+
+    def test_health_checks_are_throttled(self):
+        """Test that the node is probed at most once per health-check interval"""
+        with patch.object(self.connection, '_make_request', return_value=self._mock_response()) as mock_request:
+            self.assertTrue(self.connection._check_health())
+            self.assertTrue(self.connection._check_health())
+
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_get_address_data_aggregates_outputs(self):
+        """Test balance, token and activity-window aggregation over address outputs"""
+        outputs = {'data': [
+            {'amount': '100', 'metadata': {'transaction_id': 'tx1', 'timestamp': 1700000300}},
+            {'amount': '50', 'native_tokens': [{'id': 'tok', 'amount': '5'}],
+             'metadata': {'transaction_id': 'tx2', 'timestamp': 1700000100, 'is_spent': True}},
+            {'amount': '25', 'metadata': {'transaction_id': 'tx3', 'timestamp': 1700000200}}
+        ]}
+        with patch.object(self.connection, '_check_health', return_value=True), \
+             patch.object(self.connection, '_make_request', return_value=self._mock_response(payload=outputs)):
+            data = self.connection.get_address_data('smr1test')
+
+        self.assertEqual(data['balance'], 175)
+        self.assertEqual(data['nativeTokens'], [{'id': 'tok', 'amount': '5'}])
+        self.assertEqual(data['messageCount'], 3)
+        self.assertEqual(data['firstTransactionTimestamp'], 1700000100)
+        self.assertEqual(data['latestTransactionTimestamp'], 1700000300)
+
+    def test_iso_timestamps_are_normalized_to_epoch_seconds(self):
+        """Test that ISO-8601 and numeric-string timestamps are stored as epoch seconds"""
+        outputs = {'data': [
+            {'amount': '1', 'metadata': {'transaction_id': 'tx1', 'timestamp': '2023-11-14T22:13:20Z'}},
+            {'amount': '1', 'metadata': {'transaction_id': 'tx2', 'timestamp': '1700000100'}}
+        ]}
+        with patch.object(self.connection, '_check_health', return_value=True), \
+             patch.object(self.connection, '_make_request', return_value=self._mock_response(payload=outputs)):
+            data = self.connection.get_address_data('smr1iso')
+
+        self.assertEqual([tx['timestamp'] for tx in data['transactions']], [1700000000, 1700000100])
+        self.assertEqual(data['firstTransactionTimestamp'], 1700000000)
+
+    def test_expired_address_data_is_revalidated_with_etag(self):
+        """Test that an expired entry is revalidated and reused on 304 Not Modified"""
+        fresh = self._mock_response(payload={'data': [{'amount': '10'}]})
+        fresh.headers = {'ETag': '"v1"'}
+        not_modified = self._mock_response(status_code=304)
+
+        with patch.object(self.connection, '_check_health', return_value=True), \
+             patch.object(self.connection, '_make_request', side_effect=[fresh, not_modified]) as mock_request:
+            first = self.connection.get_address_data('smr1test')
+            self.connection.cache['address_data'].clear()  # simulate TTL expiry
+            second = self.connection.get_address_data('smr1test')
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_request.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+
+    def test_large_outputs_payload_is_streamed(self):
+        """Test that payloads above the stream threshold are parsed incrementally"""
+        payload = json.dumps({'data': [{'amount': '10'}, {'amount': '20'}]}).encode()
+        response = self._mock_response()
+        response.headers = {'Content-Length': str(len(payload))}
+        response.raw = io.BytesIO(payload)
+        self.connection._stream_threshold = 1
+
+        outputs = list(self.connection._iter_outputs(response))
+
+        self.assertEqual(outputs, [{'amount': '10'}, {'amount': '20'}])
+        response.close.assert_called_once()
+
+    def test_get_address_data_batch_fetches_misses_once(self):
+        """Test that batch lookups dedupe addresses and skip cached ones"""
+        self.connection.cache['address_data']['address_cached'] = {'address': 'cached'}
+        fetched = []
+
+        def fake_get_address_data(address):
+            fetched.append(address)
+            return {'address': address}
+
+        with patch.object(self.connection, 'get_address_data', side_effect=fake_get_address_data):
+            results = self.connection.get_address_data_batch(['a', 'cached', 'b', 'a'])
+
+        self.assertEqual(sorted(fetched), ['a', 'b'])
+        self.assertEqual(set(results), {'a', 'b', 'cached'})
+        self.assertEqual(results['cached'], {'address': 'cached'})
+
+    def test_feature_vector_transaction_statistics(self):
+        """Test regularity, cross-layer and incoming-ratio features"""
+        address_data = {
+            'balance': 1000,
+            'messageCount': 4,
+            'nativeTokens': [],
+            'firstTransactionTimestamp': 1700000000,
+            'transactions': [
+                {'timestamp': 1700000300, 'incoming': True, 'tag': 'CROSS_LAYER_TRANSFER'},
+                {'timestamp': 1700000000, 'incoming': True},
+                {'timestamp': 1700000200, 'incoming': False},
+                {'timestamp': 1700000100, 'incoming': False, 'tag': 'CROSS_LAYER_TRANSFER'}
+            ]
+        }
+        with patch.object(self.connection, 'get_address_data', return_value=address_data):
+            features = self.connection.get_iota_feature_vector('smr1test')
+
+        # Evenly spaced transactions are perfectly regular
+        self.assertAlmostEqual(features['iota_activity_regularity'], 1.0)
+        self.assertEqual(features['cross_layer_transfers'], 2)
+        self.assertAlmostEqual(features['incoming_transaction_ratio'], 0.5)
+        self.assertEqual(features['iota_transaction_count'], 4)
+
+    def test_feature_vector_uses_given_reference_time(self):
+        """Test that activity age is measured from the supplied reference time"""
+        address_data = {'balance': 0, 'messageCount': 0, 'nativeTokens': [], 'transactions': [],
+                        'firstTransactionTimestamp': 1700000000}
+        features = self.connection.get_iota_feature_vector(
+            'smr1age', address_data=address_data, now=1700000000 + 10 * 86400 + 5)
+
+        self.assertEqual(features['iota_first_activity_days'], 10)
+
+    def test_typed_features_match_feature_vector(self):
+        """Test that the typed features carry the same values as the feature dict"""
+        address_data = {'balance': 7, 'messageCount': 2, 'nativeTokens': [{'id': 't'}],
+                        'transactions': [{'timestamp': 100, 'incoming': True},
+                                         {'timestamp': 200, 'tag': 'CROSS_LAYER_TRANSFER'}]}
+        features = self.connection.get_iota_features('smr1typed', address_data=address_data, now=1000)
+        vector = self.connection.get_iota_feature_vector('smr1typed', address_data=address_data, now=1000)
+
+        self.assertIsInstance(features, IOTAFeatures)
+        self.assertEqual(FEATURE_ORDER, IOTAFeatures._fields)
+        self.assertEqual(vector, {'iota_address': 'smr1typed', **features._asdict()})
+        self.assertIsNone(self.connection.get_iota_features('smr1bad', address_data={'error': 'x'}))
+
+    def test_feature_vector_batch_matrix(self):
+        """Test that batch features are laid out in FEATURE_ORDER and skip failures"""
+        address_data = {'balance': 500, 'messageCount': 1, 'nativeTokens': [],
+                        'transactions': [{'timestamp': 1700000000, 'incoming': True}]}
+
+        def fake_get_address_data(address):
+            return {'error': 'missing'} if address == 'bad' else address_data
+
+        with patch.object(self.connection, 'get_address_data', side_effect=fake_get_address_data) as mock_fetch:
+            addresses, matrix = self.connection.get_iota_feature_vector_batch(['good', 'bad', 'good'])
+
+        # Each unique address is fetched exactly once, failed ones included
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(addresses, ['good'])
+        self.assertEqual(matrix.shape, (1, len(FEATURE_ORDER)))
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertEqual(matrix[0, FEATURE_ORDER.index('iota_balance')], 500)
+        self.assertEqual(matrix[0, FEATURE_ORDER.index('incoming_transaction_ratio')], 1.0)
+
+    def test_feature_frame_wraps_batch_matrix(self):
+        """Test that the feature frame is indexed by address with typed feature columns"""
+        matrix = np.arange(2 * len(FEATURE_ORDER), dtype=np.float32).reshape(2, -1)
+        with patch.object(self.connection, 'get_iota_feature_vector_batch',
+                          return_value=(['a', 'b'], matrix)):
+            frame = self.connection.get_iota_feature_frame(['a', 'b'])
+
+        self.assertEqual(list(frame.columns), list(FEATURE_ORDER))
+        self.assertEqual(list(frame.index), ['a', 'b'])
+        self.assertTrue((frame.dtypes == np.float32).all())
+        self.assertEqual(frame.loc['b', 'iota_balance'], matrix[1, 0])
+
+    def test_feature_vectors_async_gathers_addresses(self):
+        """Test that async feature extraction returns one vector per unique address"""
+        def fake_feature_vector(address, eth_address=None):
+            return {'iota_address': address}
+
+        with patch.object(self.connection, 'get_iota_feature_vector', side_effect=fake_feature_vector):
+            results = asyncio.run(self.connection.get_iota_feature_vectors_async(['a', 'b', 'a']))
+
+        self.assertEqual(results, {'a': {'iota_address': 'a'}, 'b': {'iota_address': 'b'}})
+
+    def test_price_history_is_cached(self):
+        """Test that repeated price history lookups are served from the TTL cache"""
+        first = self.connection.get_token_price_history('IOTA', days=5)
+        second = self.connection.get_token_price_history('IOTA', days=5)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(first), 5)
+        self.assertTrue(all(b['timestamp'] - a['timestamp'] == 86400 for a, b in zip(first, first[1:])))
+        self.assertEqual(self.connection.cache['token_prices'].maxsize, 1024)
+
+    def test_auth_headers_are_resolved_once(self):
+        """Test that configured authentication is applied to every request"""
+        with patch.object(IOTAConnection, '_connect', return_value=True), \
+             patch.object(IOTAConnection, '_load_config',
+                          return_value={'nodes': ['https://node.example'],
+                                        'authentication': {'type': 'api_key', 'api_key': 'secret'}}):
+            connection = IOTAConnection('nonexistent_config.json')
+
+        with patch.object(connection._session, 'request', return_value=self._mock_response()) as mock_request:
+            connection._make_request('https://node.example/health', headers={'X-Trace': '1'})
+
+        headers = mock_request.call_args.kwargs['headers']
+        self.assertEqual(headers['X-API-Key'], 'secret')
+        self.assertEqual(headers['X-Trace'], '1')
+        connection.close()
+
+    def test_probe_nodes_send_auth_headers(self):
+        """Test that health probes authenticate like regular requests"""
+        with patch.object(IOTAConnection, '_connect', return_value=True), \
+             patch.object(IOTAConnection, '_load_config',
+                          return_value={'nodes': ['https://node.example'],
+                                        'authentication': {'type': 'bearer', 'token': 'secret'}}):
+            connection = IOTAConnection('nonexistent_config.json')
+
+        with patch.object(connection._session, 'get', return_value=self._mock_response()) as mock_get:
+            healthy = connection._probe_nodes(['https://node.example'], timeout=1)
+
+        self.assertEqual(healthy, 'https://node.example')
+        self.assertEqual(mock_get.call_args.kwargs['headers']['Authorization'], 'Bearer secret')
+        connection.close()
+
+    def test_session_mounts_pooled_adapter(self):
+        """Test that the session is configured with a pooled adapter"""
+        adapter = self.connection._session.get_adapter('https://node.example')
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_config_file_is_parsed_once_per_path(self):
+        """Test that connections share the parsed config without sharing the dict"""
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = os.path.join(tmp, 'iota.json')
+            with open(config_path, 'w') as f:
+                json.dump({'network': 'testnet', 'nodes': ['https://node.example']}, f)
+
+            with patch('ai_iota_connection._json_loads', wraps=json.loads) as mock_loads:
+                first = IOTAConnection(config_path)
+                second = IOTAConnection(config_path)
+
+        self.assertEqual(mock_loads.call_count, 1)
+        self.assertEqual(first.config, second.config)
+        self.assertIsNot(first.config, second.config)
+        self.assertEqual(second.nodes, ['https://node.example'])
+
+    def test_session_advertises_compression(self):
+        """Test that the session asks nodes for compressed responses"""
+        self.assertIn('gzip', self.connection._session.headers['Accept-Encoding'])
+
+class TestGetIOTAConnection(unittest.TestCase):
+    """Test cases for the shared connection factory"""
+
+    def tearDown(self):
+        """Discard shared connections between tests"""
+        reset_iota_connection()
+
+    @patch('ai_iota_connection.IOTAConnection', wraps=IOTAConnection)
+    def test_connection_is_shared_per_config(self, mock_class):
+        """Test that repeated lookups reuse the same connection"""
+        first = get_iota_connection('nonexistent_config.json')
+        second = get_iota_connection('nonexistent_config.json')
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_class.call_count, 1)
+
+    def test_reset_creates_fresh_connection(self):
+        """Test that resetting discards the shared connection"""
+        first = get_iota_connection('nonexistent_config.json')
+        reset_iota_connection()
+        second = get_iota_connection('nonexistent_config.json')
+
+        self.assertIsNot(first, second)
+
+    @patch('ai_iota_connection.IOTAConnection',
+           side_effect=lambda path: (time.sleep(0.05), IOTAConnection(path))[1])
+    def test_concurrent_first_lookups_create_one_connection(self, mock_class):
+        """Test that racing first callers share a single connection"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            connections = list(executor.map(
+                lambda _: get_iota_connection('nonexistent_config.json'), range(8)))
+
+        self.assertEqual(len({id(c) for c in connections}), 1)
+        self.assertEqual(mock_class.call_count, 1)
+
+    @patch.object(IOTAConnection, '_connect')
+    def test_construction_does_not_probe_nodes(self, mock_connect):
+        """Test that nodes are only probed once a caller needs the network"""
+        connection = get_iota_connection('nonexistent_config.json')
+
+        self.assertFalse(connection.is_connected)
+        mock_connect.assert_not_called()
+
+    def test_ensure_connected_probes_once_for_concurrent_callers(self):
+        """Test that concurrent first users share one connection attempt"""
+        connection = get_iota_connection('nonexistent_config.json')
+
+        def fake_connect():
+            time.sleep(0.05)
+            connection.is_connected = True
+            return True
+
+        with patch.object(connection, '_connect', side_effect=fake_connect) as mock_connect:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: connection.ensure_connected(), range(8)))
+
+        self.assertTrue(all(results))
+        self.assertEqual(mock_connect.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
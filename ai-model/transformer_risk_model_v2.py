@@ -797,8 +797,9 @@ class AdvancedTransformerRiskModel:
         if self.transformer_model is None:
             raise ValueError("Model not trained or loaded. Call train() or load_model() first.")
         
-        # Preprocess structured data
-        X_structured = self.preprocess_data(user_data)
+        # Preprocess structured data, handing the model float32 (the dtype of its
+        # structured input layer) instead of the scaler's float64
+        X_structured = self.preprocess_data(user_data).astype(np.float32)
         
         # Extract text features
         X_tx_patterns = self._extract_text_feature(user_data, 'transaction_patterns')